@@ -0,0 +1,330 @@
+"""Offline benchmark for MarkLang.
+
+Runs synthetic Hugo corpora through the real pipeline against a stub Ollama server and a fake
+Google translator, then prints machine-readable JSON that can be compared between versions:
+
+    python benchmark.py --output before.json
+    python benchmark.py --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Synthetic corpora: (number of files, post generator name)
+SCENARIOS = {
+    "short": (50, "short"),
+    "code-heavy": (50, "code_heavy"),
+    "tag-heavy": (50, "tag_heavy"),
+    "tree-1000": (1000, "mixed"),
+}
+
+TAG_POOL = [
+    "Linux", "Automation", "SSH", "Docker", "Kubernetes", "Python", "Networking", "Security",
+    "Backup", "Git", "Cloud Computing", "DevOps", "Monitoring", "Ansible", "Nginx", "Databases",
+    "Home Lab", "Raspberry Pi", "Scripting", "Virtualization",
+]
+
+WORDS = (
+    "the server keeps a small cache of recent requests so that repeated lookups stay fast while "
+    "new entries are written to disk in the background and old ones expire after a while"
+).split()
+
+# Pulls the text to translate out of any of MarkLang's prompt templates
+PROMPT_TEXT_RE = re.compile(r'(?:Title|Description|content|Text):\s*"(.*)"', re.S)
+PACKED_ITEMS_MARKER = "Items:\n\n"
+
+def prose(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def frontmatter_block(rng: random.Random, index: int, tags: int) -> str:
+    tag_list = ", ".join(f'"{tag}"' for tag in rng.sample(TAG_POOL, min(tags, len(TAG_POOL))))
+    return (
+        "---\n"
+        f'title: "Post {index}: {prose(rng, 6)}"\n'
+        f'description: "{prose(rng, 20)}"\n'
+        f'summary: "{prose(rng, 12)}"\n'
+        f"tags: [{tag_list}]\n"
+        f'categories: ["{rng.choice(TAG_POOL)}", "{rng.choice(TAG_POOL)}"]\n'
+        f"date: 2024-01-{index % 28 + 1:02d}\n"
+        "draft: false\n"
+        "author: Rohan Batra\n"
+        "---\n\n"
+    )
+
+def short_post(rng: random.Random, index: int) -> str:
+    return frontmatter_block(rng, index, 3) + f"# {prose(rng, 4)}\n\n{prose(rng, 40)}\n\n{prose(rng, 30)}\n"
+
+def code_heavy_post(rng: random.Random, index: int) -> str:
+    body = [f"# {prose(rng, 4)}\n", f"{prose(rng, 25)} Run `ssh -i key host` first.\n"]
+    for block in range(6):
+        body.append(f"## Step {block + 1}\n")
+        body.append(f"{prose(rng, 15)} See https://example.com/docs/{block}.\n")
+        code = "\n".join(f"sudo systemctl restart service-{block}-{line}" for line in range(15))
+        body.append(f"```bash\n{code}\n```\n")
+    return frontmatter_block(rng, index, 4) + "\n".join(body)
+
+def tag_heavy_post(rng: random.Random, index: int) -> str:
+    return frontmatter_block(rng, index, 15) + f"{prose(rng, 20)}\n"
+
+def mixed_post(rng: random.Random, index: int) -> str:
+    return rng.choice([short_post, code_heavy_post, tag_heavy_post])(rng, index)
+
+POST_GENERATORS = {
+    "short": short_post,
+    "code_heavy": code_heavy_post,
+    "tag_heavy": tag_heavy_post,
+    "mixed": mixed_post,
+}
+
+def write_corpus(root: str, files: int, generator: str, seed: int = 0) -> str:
+    """Write a synthetic Hugo content tree and return its source-language directory."""
+    rng = random.Random(seed)
+    content_root = os.path.join(root, "content", "en")
+    for index in range(files):
+        section = os.path.join(content_root, "posts", f"section-{index // 100}")
+        os.makedirs(section, exist_ok=True)
+        with open(os.path.join(section, f"post-{index}.md"), "w", encoding="utf-8") as f:
+            f.write(POST_GENERATORS[generator](rng, index))
+    return content_root
+
+class StubOllama:
+    """Local stand-in for Ollama's /api/generate that echoes the text back at a simulated token rate."""
+
+    def __init__(self, first_token_latency: float, token_latency: float, parallel: int):
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.slots = threading.Semaphore(max(parallel, 1))
+        self.stats = {"requests": 0, "prompt_tokens": 0, "eval_tokens": 0}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}/api/generate"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send_json(self, payload: dict) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                self._send_json({"models": []})
+
+            def do_POST(self) -> None:
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                prompt = payload.get("prompt", "")
+                if payload.get("format") == "json" and PACKED_ITEMS_MARKER in prompt:
+                    # Packed fields: answer with the same numbered object
+                    text = json.dumps(json.loads(prompt.split(PACKED_ITEMS_MARKER, 1)[1]), ensure_ascii=False)
+                else:
+                    match = PROMPT_TEXT_RE.search(prompt)
+                    text = match.group(1) if match else prompt
+                prompt_tokens, eval_tokens = len(prompt.split()), max(len(text.split()), 1)
+                with stub._lock:
+                    stub.stats["requests"] += 1
+                    stub.stats["prompt_tokens"] += prompt_tokens
+                    stub.stats["eval_tokens"] += eval_tokens
+                with stub.slots:
+                    duration = stub.first_token_latency + eval_tokens * stub.token_latency
+                    time.sleep(duration)
+                final = {
+                    "done": True,
+                    "prompt_eval_count": prompt_tokens,
+                    "eval_count": eval_tokens,
+                    "eval_duration": int(duration * 1e9),
+                }
+                if not payload.get("stream"):
+                    self._send_json(dict(final, response=text))
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for line in (dict(response=text, done=False), dict(final, response="")):
+                    chunk = (json.dumps(line) + "\n").encode("utf-8")
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.write(b"0\r\n\r\n")
+
+        return Handler
+
+    def start(self) -> None:
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self.server.shutdown()
+
+class FakeTranslated:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeTranslator:
+    """Googletrans stand-in: marks every line as translated after a fixed delay."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = 0
+
+    async def translate(self, text, dest: str = "en", src: str = "auto"):
+        if isinstance(text, list):
+            return [await self.translate(item, dest=dest, src=src) for item in text]
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return FakeTranslated("\n".join(f"{line} [{dest}]" for line in text.split("\n")))
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)]
+
+def run_scenario(args: argparse.Namespace) -> dict:
+    """Run one scenario in this process and return its measurements."""
+    stub = StubOllama(args.first_token_latency, args.token_latency, args.stub_parallel)
+    stub.start()
+    # main captures the API URL at import time, so point it at the stub first
+    os.environ["OLLAMA_API_URL"] = stub.url
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import main
+
+    files, generator = SCENARIOS[args.run_scenario]
+    if args.files:
+        files = args.files
+    workdir = tempfile.mkdtemp(prefix="marklang-bench-")
+    try:
+        content_root = write_corpus(workdir, files, generator)
+        logging.basicConfig(level=logging.ERROR)
+        fake_translator = FakeTranslator(args.googletrans_latency)
+        main.translator = fake_translator
+        main.SOURCE_LANG, main.TARGET_LANG = "en", args.target_lang
+        main.GLOSSARY_CACHE_DIR = os.path.join(workdir, "cache")
+        main.configure_ollama_client(args.max_inflight, 300.0)
+        if args.pack:
+            main.PACKER = main.SegmentPacker()
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.load_custom_dictionary(args.target_lang, os.path.join(os.path.dirname(os.path.abspath(__file__)), "translations"))
+            stats = asyncio.run(main.with_worker_pool(main.process_site_async(content_root, args.concurrency)))
+    finally:
+        stub.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    latencies = stats["latencies"]
+    return {
+        "scenario": args.run_scenario,
+        "files": stats["files"],
+        "failed": stats["failed"],
+        "elapsed_s": round(stats["elapsed"], 4),
+        "files_per_sec": round(stats["files"] / stats["elapsed"], 3) if stats["elapsed"] > 0 else 0.0,
+        "latency_p50_s": round(percentile(latencies, 0.50), 4),
+        "latency_p95_s": round(percentile(latencies, 0.95), 4),
+        "ollama_requests": stub.stats["requests"],
+        "ollama_prompt_tokens": stub.stats["prompt_tokens"],
+        "ollama_eval_tokens": stub.stats["eval_tokens"],
+        "googletrans_requests": fake_translator.requests,
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def compare(current: dict, baseline_path: str) -> None:
+    """Print the relative change of each metric against an earlier benchmark file."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {result["scenario"]: result for result in json.load(f)["results"]}
+    for result in current["results"]:
+        before = baseline.get(result["scenario"])
+        if before is None:
+            continue
+        for metric in ("files_per_sec", "latency_p50_s", "latency_p95_s", "ollama_requests", "peak_rss_mb"):
+            old, new = before.get(metric), result.get(metric)
+            if old:
+                print(f"{result['scenario']:>12} {metric:>16}: {old} -> {new} ({(new - old) / old:+.1%})", file=sys.stderr)
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MarkLang offline against stub Ollama and Google Translate services.")
+    parser.add_argument("--scenarios", type=str, default=",".join(SCENARIOS), help=f"Comma-separated scenarios (default: {','.join(SCENARIOS)})")
+    parser.add_argument("--files", type=int, default=0, help="Override the number of files in every scenario")
+    parser.add_argument("--target-lang", type=str, default="hi", help="Target language code (default: hi)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Files translated concurrently (default: 8)")
+    parser.add_argument("--max-inflight", type=int, default=8, help="Concurrent Ollama requests (default: 8)")
+    parser.add_argument("--first-token-latency", type=float, default=0.02, help="Stub Ollama latency before the first token, in seconds (default: 0.02)")
+    parser.add_argument("--token-latency", type=float, default=0.001, help="Stub Ollama latency per generated token, in seconds (default: 0.001)")
+    parser.add_argument("--stub-parallel", type=int, default=4, help="Generations the stub Ollama serves at once (default: 4)")
+    parser.add_argument("--googletrans-latency", type=float, default=0.01, help="Fake Google Translate latency per request, in seconds (default: 0.01)")
+    parser.add_argument("--pack", action="store_true", help="Run the pipeline with short-field packing enabled")
+    parser.add_argument("--output", type=str, default="", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--compare", type=str, default="", help="Earlier JSON report to compare against")
+    parser.add_argument("--run-scenario", type=str, default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scenario:
+        print(json.dumps(run_scenario(args)))
+        return
+
+    # Each scenario runs in a fresh interpreter so peak RSS and module state are not shared
+    forwarded = []
+    for option in ("files", "target_lang", "concurrency", "max_inflight", "first_token_latency",
+                   "token_latency", "stub_parallel", "googletrans_latency"):
+        forwarded.extend([f"--{option.replace('_', '-')}", str(getattr(args, option))])
+    if args.pack:
+        forwarded.append("--pack")
+    results = []
+    for scenario in [name.strip() for name in args.scenarios.split(",") if name.strip()]:
+        if scenario not in SCENARIOS:
+            print(f"[ERROR] Unknown scenario: {scenario}. Choose from {list(SCENARIOS)}", file=sys.stderr)
+            exit(1)
+        print(f"[INFO] Running scenario {scenario}...", file=sys.stderr)
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--run-scenario", scenario, *forwarded],
+            capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            print(completed.stderr, file=sys.stderr)
+            exit(completed.returncode)
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    report = {"revision": git_revision(), "python": sys.version.split()[0], "settings": vars(args), "results": results}
+    del report["settings"]["run_scenario"]
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        compare(report, args.compare)
+
+if __name__ == "__main__":
+    main_cli()
@@ -6,10 +6,26 @@ import asyncio
 import argparse
 import csv
 import logging
+import time
+import hashlib
+import json
+import re
+import glob
+import pickle
+import random
+import sqlite3
+import threading
+import contextvars
+import contextlib
+from collections import OrderedDict, deque
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 
 # Global language settings
 SOURCE_LANG = "en"  # English
 TARGET_LANG = "fr"  # Hindi
+TARGET_LANGS = [TARGET_LANG]  # Every language of a fan-out run; TARGET_LANG is the first
 
 # Translation model and API settings
 TRANSLATION_MODEL = "llama3.2:3b"
@@ -45,6 +61,36 @@ CONTENT_TRANSLATION_PROMPT = (
     "Here is the Markdown content:\n\n\"{text}\"\n"
 )
 
+SEGMENT_TRANSLATION_PROMPT = (
+    "You are an expert translator specializing in content localization and digital media. "
+    "Translate the following piece of a Markdown document from {source_lang_full} ({source_lang_code}) to {target_lang_full} ({target_lang_code}).\n\n"
+    "Tokens like @@0@@, @@1@@ stand for code, links or markup: copy every one of them exactly once and unchanged.\n\n"
+    "Preserve Markdown emphasis such as **bold**, *italic* and [link text].\n\n"
+    "Do not explain anything—just return the translated text.\n\n"
+    "{glossary}"
+    "Text:\n\n\"{text}\"\n"
+)
+
+GLOSSARY_HINT = "Always use these translations for the following terms:\n{terms}\n\n"
+
+PACKED_TRANSLATION_PROMPT = (
+    "You are an expert translator specializing in content localization and digital media. "
+    "Translate every value of the following JSON object from {source_lang_full} ({source_lang_code}) to {target_lang_full} ({target_lang_code}). "
+    "Each value is a blog post title, description or notice: make each translation natural, concise and idiomatic, in a single line and without surrounding quotes.\n\n"
+    "Return only a JSON object with exactly the same keys, mapping each key to its translation.\n\n"
+    "Items:\n\n{items}\n"
+)
+
+# Translate the body block by block so code, tables markup and HTML never reach the model
+SEGMENT_MARKDOWN = True
+
+# Largest input, in estimated tokens, sent to the model as one body request; longer text is split
+CHUNK_TOKENS = 1024
+
+# Stream body translations to a temporary output file instead of waiting for whole responses
+STREAM_OUTPUT = False
+STALL_TIMEOUT = 60.0
+
 # Add toggles for rendering specific keys
 RENDER_KEYS = {
     "title": True,
@@ -61,6 +107,333 @@ RENDER_KEYS = {
 # Initialize the Google Translator
 translator = Translator()
 
+# Per-stage timing and token metrics, aggregated per file and per run
+CURRENT_FILE = contextvars.ContextVar("CURRENT_FILE", default="-")
+CURRENT_STAGE = contextvars.ContextVar("CURRENT_STAGE", default="-")
+METRIC_FIELDS = ("calls", "seconds", "bytes", "prompt_tokens", "eval_tokens", "eval_seconds", "prompt_eval_seconds")
+
+class RunMetrics:
+    """Collects wall time, bytes and Ollama token counts for each (file, stage) pair."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, file_path: str, stage_name: str) -> dict:
+        return self.entries.setdefault((file_path, stage_name), dict.fromkeys(METRIC_FIELDS, 0))
+
+    def record(self, stage_name: str, seconds: float, size: int = 0) -> None:
+        with self._lock:
+            entry = self._entry(CURRENT_FILE.get(), stage_name)
+            entry["calls"] += 1
+            entry["seconds"] += seconds
+            entry["bytes"] += size
+
+    def record_ollama(self, data: dict) -> None:
+        """Attribute the token counts of an Ollama response to the current file and stage."""
+        with self._lock:
+            entry = self._entry(CURRENT_FILE.get(), CURRENT_STAGE.get())
+            entry["prompt_tokens"] += data.get("prompt_eval_count", 0) or 0
+            entry["eval_tokens"] += data.get("eval_count", 0) or 0
+            entry["eval_seconds"] += (data.get("eval_duration", 0) or 0) / 1e9
+            entry["prompt_eval_seconds"] += (data.get("prompt_eval_duration", 0) or 0) / 1e9
+
+    def run_totals(self) -> dict:
+        """Sum every stage across files."""
+        totals = {}
+        with self._lock:
+            for (_, stage_name), entry in self.entries.items():
+                total = totals.setdefault(stage_name, dict.fromkeys(METRIC_FIELDS, 0))
+                for field in METRIC_FIELDS:
+                    total[field] += entry[field]
+        return totals
+
+    def to_jsonl(self) -> str:
+        lines = []
+        with self._lock:
+            for (file_path, stage_name), entry in sorted(self.entries.items()):
+                lines.append(json.dumps(dict(scope="file", file=file_path, stage=stage_name, **entry)))
+        for stage_name, total in sorted(self.run_totals().items()):
+            lines.append(json.dumps(dict(scope="run", stage=stage_name, **total)))
+        lines.append(json.dumps({"scope": "run", "stage": "wall", "seconds": time.time() - self.started}))
+        return "\n".join(lines) + "\n"
+
+    def to_prometheus(self) -> str:
+        """Run-level totals in the node_exporter textfile format (per-file labels would explode cardinality)."""
+        totals = self.run_totals()
+        lines = []
+        for field in METRIC_FIELDS:
+            name = f"marklang_stage_{field}_total"
+            lines.append(f"# TYPE {name} counter")
+            for stage_name, total in sorted(totals.items()):
+                lines.append(f'{name}{{stage="{stage_name}"}} {total[field]}')
+        lines.append("# TYPE marklang_run_seconds gauge")
+        lines.append(f"marklang_run_seconds {time.time() - self.started}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str, fmt: str = "") -> None:
+        """Write the metrics as JSON lines or a Prometheus textfile, replacing path atomically."""
+        fmt = fmt or ("prometheus" if path.endswith(".prom") else "jsonl")
+        text = self.to_prometheus() if fmt == "prometheus" else self.to_jsonl()
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(f"{path}.tmp", path)
+
+METRICS = RunMetrics()
+
+@contextlib.contextmanager
+def stage(stage_name: str, size: int = 0):
+    """Time a block and attribute it, and any Ollama tokens spent inside it, to stage_name."""
+    token = CURRENT_STAGE.set(stage_name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        METRICS.record(stage_name, time.perf_counter() - started, size)
+        CURRENT_STAGE.reset(token)
+
+class TranslationError(Exception):
+    """Raised when a markdown file cannot be translated."""
+
+class OllamaUnavailableError(TranslationError):
+    """Raised when no Ollama endpoint accepts a request, so the post fails instead of embedding an error string."""
+
+# Pool of Ollama endpoints with least-outstanding-requests balancing
+class OllamaEndpoint:
+    """One Ollama server: its weight, in-flight cap, ejection state and latency/error stats."""
+
+    def __init__(self, url: str, weight: float = 1.0, max_inflight: int = 8):
+        self.url = url if "/api/" in url else url.rstrip("/") + "/api/generate"
+        self.weight = max(weight, 0.01)
+        self.max_inflight = max(max_inflight, 1)
+        self.outstanding = 0
+        self.ejected_until = 0.0
+        self.consecutive_failures = 0
+        self.stats = {"requests": 0, "errors": 0, "ejections": 0}
+        self.latencies = []
+
+    @property
+    def health_url(self) -> str:
+        return self.url.split("/api/", 1)[0] + "/api/tags"
+
+    def report(self) -> str:
+        latencies = sorted(self.latencies)
+        p50 = latencies[len(latencies) // 2] if latencies else 0.0
+        p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] if latencies else 0.0
+        return (f"{self.url}: {self.stats['requests']} requests, {self.stats['errors']} errors, "
+                f"{self.stats['ejections']} ejections, p50 {p50:.2f}s, p95 {p95:.2f}s")
+
+def parse_endpoint_spec(spec: str, default_max_inflight: int = 8) -> OllamaEndpoint:
+    """Parse "URL[,weight=W][,max-inflight=N]"; a bare host URL gets /api/generate appended."""
+    url, *options = [part.strip() for part in spec.split(",")]
+    settings = {"weight": 1.0, "max-inflight": default_max_inflight}
+    for option in options:
+        name, _, value = option.partition("=")
+        if name not in settings or not value:
+            raise ValueError(f"Unknown endpoint option '{option}' in '{spec}'")
+        settings[name] = float(value) if name == "weight" else int(value)
+    return OllamaEndpoint(url, weight=settings["weight"], max_inflight=settings["max-inflight"])
+
+# Pooled, keep-alive HTTP client for the Ollama API
+class OllamaClient:
+    """Shares one requests.Session across threads and spreads requests over a pool of Ollama endpoints.
+
+    Each request goes to the healthy endpoint with the fewest outstanding requests relative to its weight,
+    and waits while every endpoint is at its in-flight cap. An endpoint that refuses connections is ejected
+    for eject_seconds (doubling on every consecutive failure) and the request fails over to the next one;
+    once its ejection expires the next request routed to it acts as the probe. When every endpoint is
+    ejected, requests wait for the earliest one to come back, and fail with OllamaUnavailableError only
+    once that would take longer than the read timeout.
+    """
+
+    def __init__(self, endpoints: Optional[list] = None, max_inflight: int = 8, connect_timeout: float = 10.0,
+                 read_timeout: float = 300.0, eject_seconds: float = 5.0, keep_alive: Optional[str] = None):
+        self.keep_alive = keep_alive
+        self.endpoints = endpoints or [OllamaEndpoint(TRANSLATION_API_URL, max_inflight=max_inflight)]
+        self.max_inflight = sum(endpoint.max_inflight for endpoint in self.endpoints)
+        self.timeout = (connect_timeout, read_timeout)
+        self.eject_seconds = eject_seconds
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.endpoints),
+                              pool_maxsize=max(endpoint.max_inflight for endpoint in self.endpoints))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._changed = threading.Condition()
+
+    def check_health(self) -> dict:
+        """GET /api/tags on every endpoint, ejecting the ones that do not answer. Returns {url: healthy}."""
+        health = {}
+        for endpoint in self.endpoints:
+            try:
+                self.session.get(endpoint.health_url, timeout=self.timeout[0]).raise_for_status()
+                health[endpoint.url] = True
+            except requests.RequestException as e:
+                logging.warning(f"Ollama endpoint {endpoint.url} failed its health check: {e}")
+                with self._changed:
+                    self._eject(endpoint)
+                health[endpoint.url] = False
+        return health
+
+    def _eject(self, endpoint: OllamaEndpoint) -> None:
+        if endpoint.ejected_until > time.monotonic():
+            return  # Another in-flight request already reported it
+        endpoint.consecutive_failures += 1
+        endpoint.stats["ejections"] += 1
+        delay = self.eject_seconds * 2 ** min(endpoint.consecutive_failures - 1, 4)
+        endpoint.ejected_until = time.monotonic() + delay
+        logging.warning(f"Ejecting Ollama endpoint {endpoint.url} for {delay:.0f}s.")
+
+    def _acquire(self, tried: set, deadline: float) -> OllamaEndpoint:
+        """Reserve a slot on the least-loaded healthy endpoint, preferring ones not yet tried for this request.
+
+        While every endpoint is ejected, wait for the earliest to come back, up to deadline.
+        """
+        with self._changed:
+            while True:
+                now = time.monotonic()
+                healthy = [endpoint for endpoint in self.endpoints if endpoint.ejected_until <= now]
+                if not healthy:
+                    earliest = min(endpoint.ejected_until for endpoint in self.endpoints)
+                    if earliest > deadline:
+                        raise OllamaUnavailableError(
+                            f"No reachable Ollama endpoint within {self.timeout[1]:.0f}s "
+                            f"({len(self.endpoints)} ejected, {len(tried)} refused this request)")
+                    self._changed.wait(earliest - now)
+                    continue
+                candidates = [endpoint for endpoint in healthy if endpoint not in tried] or healthy
+                free = [endpoint for endpoint in candidates if endpoint.outstanding < endpoint.max_inflight]
+                if free:
+                    endpoint = min(free, key=lambda e: (e.outstanding + 1) / e.weight)
+                    endpoint.outstanding += 1
+                    return endpoint
+                self._changed.wait(1.0)
+
+    def _release(self, endpoint: OllamaEndpoint, started: float, failed: bool = False, unreachable: bool = False) -> None:
+        with self._changed:
+            endpoint.outstanding -= 1
+            endpoint.stats["requests"] += 1
+            if failed:
+                endpoint.stats["errors"] += 1
+            else:
+                endpoint.latencies.append(time.monotonic() - started)
+            if unreachable:
+                self._eject(endpoint)
+            elif not failed:
+                endpoint.consecutive_failures = 0
+            self._changed.notify_all()
+
+    def _dispatch(self, send, api_url: Optional[str]):
+        """Call send(url) on a pooled endpoint, failing over while endpoints refuse connections.
+
+        An explicit api_url bypasses the pool.
+        """
+        if api_url is not None:
+            try:
+                return send(api_url)
+            except requests.ConnectionError as e:
+                raise OllamaUnavailableError(f"Could not connect to Ollama at {api_url}: {e}") from e
+        tried = set()
+        deadline = time.monotonic() + self.timeout[1]
+        while True:
+            endpoint = self._acquire(tried, deadline)
+            started = time.monotonic()
+            try:
+                result = send(endpoint.url)
+            except requests.ConnectionError as e:
+                logging.warning(f"Could not connect to Ollama endpoint {endpoint.url}: {e}")
+                self._release(endpoint, started, failed=True, unreachable=True)
+                tried.add(endpoint)
+                continue
+            except BaseException:
+                self._release(endpoint, started, failed=True)
+                raise
+            self._release(endpoint, started)
+            return result
+
+    def _with_keep_alive(self, payload: dict) -> dict:
+        """Ask Ollama to keep the model loaded between requests, so fanned-out jobs never hit a cold start."""
+        return dict(payload, keep_alive=self.keep_alive) if self.keep_alive else payload
+
+    def generate(self, payload: dict, api_url: Optional[str] = None) -> dict:
+        """POST a generate request and return the decoded JSON; raises requests exceptions on failure."""
+        payload = self._with_keep_alive(payload)
+        def send(url: str) -> dict:
+            response = self.session.post(url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        data = self._dispatch(send, api_url)
+        METRICS.record_ollama(data)
+        return data
+
+    def generate_stream(self, payload: dict, api_url: Optional[str] = None, on_chunk=None,
+                        stall_timeout: float = 60.0) -> dict:
+        """Consume Ollama's NDJSON token stream.
+
+        Each response fragment is passed to on_chunk as it arrives; without a callback the fragments are
+        joined into the returned "response". stall_timeout bounds the silence between two reads, while the
+        client's read timeout bounds the whole generation. A stream is only failed over to another endpoint
+        before its first fragment was delivered.
+        """
+        payload = self._with_keep_alive(payload)
+        def send(url: str) -> dict:
+            deadline = time.monotonic() + self.timeout[1]
+            parts = []
+            final = {}
+            with self.session.post(url, json=dict(payload, stream=True), stream=True,
+                                   timeout=(self.timeout[0], stall_timeout)) as response:
+                response.raise_for_status()
+                try:
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        data = json.loads(line)
+                        if "error" in data:
+                            raise requests.RequestException(f"Ollama error: {data['error']}")
+                        fragment = data.get("response", "")
+                        if fragment:
+                            if on_chunk is not None:
+                                on_chunk(fragment)
+                            else:
+                                parts.append(fragment)
+                        if data.get("done"):
+                            final = data
+                            break
+                        if time.monotonic() > deadline:
+                            raise requests.Timeout(f"Generation exceeded {self.timeout[1]:.0f}s")
+                except requests.ConnectionError as e:
+                    raise requests.RequestException(f"Stream interrupted: {e}") from e
+            final["response"] = "".join(parts)
+            return final
+        final = self._dispatch(send, api_url)
+        METRICS.record_ollama(final)
+        return final
+
+    def report(self) -> list:
+        """One stats line per endpoint."""
+        return [endpoint.report() for endpoint in self.endpoints]
+
+    def close(self) -> None:
+        self.session.close()
+
+OLLAMA_CLIENT = OllamaClient()
+
+def configure_ollama_client(max_inflight: int, read_timeout: float, endpoint_specs: Optional[list] = None,
+                            keep_alive: Optional[str] = None) -> None:
+    """Replace the shared Ollama client with one sized for this run, over endpoint_specs if given."""
+    global OLLAMA_CLIENT
+    OLLAMA_CLIENT.close()
+    endpoints = [parse_endpoint_spec(spec, max_inflight) for spec in endpoint_specs or []]
+    OLLAMA_CLIENT = OllamaClient(endpoints, max_inflight=max_inflight, read_timeout=read_timeout, keep_alive=keep_alive)
+
+async def with_worker_pool(coro):
+    """Await coro after sizing the loop's default executor so every Ollama slot can be busy at once."""
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=OLLAMA_CLIENT.max_inflight + 4))
+    return await coro
+
+class FrontmatterValidationError(TranslationError):
+    """Raised when the generated frontmatter keeps failing validation."""
+
 LANGUAGE_NAMES = {
     "en": "English",
     "hi": "Hindi",
@@ -105,14 +478,117 @@ def clean_special_quotes(text: str) -> str:
     text = replace_hash_quote(text)
     return text
 
+# Persistent translation memory shared by the Ollama and Googletrans paths
+class TranslationCache:
+    """On-disk SQLite translation memory with hit/miss counters and LRU eviction."""
+
+    FILENAME = "translations.sqlite3"
+
+    def __init__(self, cache_dir: str = ".marklang_cache", max_entries: int = 100000, refresh: bool = False,
+                 read_only: bool = False):
+        """With read_only, open an existing cache for lookups only: hits neither refresh LRU order nor commit."""
+        self.path = os.path.join(cache_dir, self.FILENAME)
+        self.max_entries = max_entries
+        self.refresh = refresh
+        self.read_only = read_only
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if read_only:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._size = 0
+            return
+        os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    @staticmethod
+    def make_key(text: str, source_lang: str, target_lang: str, model: str, template: str) -> str:
+        """Hash everything that influences a translation into a single cache key."""
+        digest = hashlib.sha256()
+        for part in (text, source_lang, target_lang, model, template):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached translation for key, or None on a miss (always a miss when refreshing)."""
+        with self._lock:
+            row = None if self.refresh else self._conn.execute(
+                "SELECT value FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if not self.read_only:
+                self._conn.execute("UPDATE translations SET last_used = ? WHERE key = ?", (time.time(), key))
+                self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """Store a translation and evict the least recently used entries beyond max_entries."""
+        if self.read_only:
+            return
+        with self._lock:
+            existed = self._conn.execute("SELECT 1 FROM translations WHERE key = ?", (key,)).fetchone() is not None
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (key, value, last_used) VALUES (?, ?, ?)",
+                (key, value, time.time())
+            )
+            if not existed:
+                self._size += 1
+            if self._size > self.max_entries:
+                overflow = self._size - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM translations WHERE key IN (SELECT key FROM translations ORDER BY last_used LIMIT ?)",
+                    (overflow,)
+                )
+                self._size -= overflow
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+# Set by main_cli unless --no-cache is given
+TRANSLATION_CACHE: Optional[TranslationCache] = None
+
+# Set while retrying a field, so a cached result that failed validation is replaced rather than reused
+CACHE_BYPASS = contextvars.ContextVar("CACHE_BYPASS", default=False)
+
+def cache_lookup(text: str, source_lang: str, target_lang: str, model: str, template: str) -> tuple:
+    """Return (key, cached value or None); both are None when caching is disabled."""
+    if TRANSLATION_CACHE is None:
+        return None, None
+    key = TranslationCache.make_key(text, source_lang, target_lang, model, template)
+    if CACHE_BYPASS.get():
+        return key, None
+    return key, TRANSLATION_CACHE.get(key)
+
+def cache_store(key: Optional[str], value: str) -> None:
+    """Store a successful translation under a key obtained from cache_lookup."""
+    if TRANSLATION_CACHE is not None and key is not None and value:
+        TRANSLATION_CACHE.put(key, value)
+
 def translate_title(
     title: str,
     source_lang: str,
     target_lang: str,
     model: str,
-    api_url: str = TRANSLATION_API_URL
+    api_url: Optional[str] = None
 ) -> str:
-    print(f"[LOG] Translating title: '{title}' from {source_lang} to {target_lang}")
+    logging.debug("Translating title: '%s' from %s to %s", title, source_lang, target_lang)
+    cache_key, cached = cache_lookup(title, source_lang, target_lang, model, TITLE_TRANSLATION_PROMPT)
+    if cached is not None:
+        logging.info("Using cached title translation.")
+        return replace_double_with_single_quotes(cached)
     prompt = TITLE_TRANSLATION_PROMPT.format(
         source_lang_full=LANGUAGE_NAMES[source_lang],
         source_lang_code=source_lang,
@@ -125,26 +601,20 @@ def translate_title(
         "prompt": prompt,
         "stream": False
     }
-    print(f"[LOG] Sending title translation request to API: {api_url}")
+    logging.debug("Sending title translation request to API: %s", api_url)
     try:
-        response = requests.post(api_url, json=payload)
-        response.raise_for_status()
-        data = response.json()
+        data = OLLAMA_CLIENT.generate(payload, api_url)
         translated_text = data.get("response", "").strip("")
-        print(f"[LOG] Title translation result: {translated_text}")
+        cache_store(cache_key, translated_text)
+        logging.debug("Title translation result: %s", translated_text)
         return replace_double_with_single_quotes(translated_text)
-    except requests.ConnectionError as e:
-        print("[ERROR] Could not connect to Ollama server. Please ensure the Ollama server is running and accessible.")
-        return "[Error] Ollama server connection issue. Please check the server."
     except requests.RequestException as e:
         print(f"[ERROR] Title translation failed: {e}")
         return f"[Error] {e}"
 
-def validate_frontmatter(file_path: str) -> bool:
+def validate_frontmatter_text(content: str) -> bool:
+    """Validate a rendered document's frontmatter without touching disk."""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
         # Check if frontmatter starts with '---' and contains a closing '---' (not necessarily at the end)
         if not content.startswith("---\n"):
             return False
@@ -165,14 +635,26 @@ def validate_frontmatter(file_path: str) -> bool:
         print(f"[Error] Validation failed: {e}")
         return False
 
+def frontmatter_line_is_valid(key: str, line: str) -> bool:
+    """Check that a single rendered `key: value` line parses as YAML and still defines key."""
+    try:
+        return key in frontmatter.loads(f"---\n{line}\n---\n").metadata
+    except Exception as e:
+        logging.warning(f"Frontmatter field '{key}' does not parse: {e}")
+        return False
+
 def translate_description(
     description: str,
     source_lang: str,
     target_lang: str,
     model: str,
-    api_url: str = TRANSLATION_API_URL
+    api_url: Optional[str] = None
 ) -> str:
-    print(f"[LOG] Translating description: '{description}' from {source_lang} to {target_lang}")
+    logging.debug("Translating description: '%.100s' from %s to %s", description, source_lang, target_lang)
+    cache_key, cached = cache_lookup(description, source_lang, target_lang, model, DESCRIPTION_TRANSLATION_PROMPT)
+    if cached is not None:
+        logging.info("Using cached description translation.")
+        return replace_double_with_single_quotes(cached)
     prompt = DESCRIPTION_TRANSLATION_PROMPT.format(
         source_lang_full=LANGUAGE_NAMES[source_lang],
         source_lang_code=source_lang,
@@ -185,17 +667,13 @@ def translate_description(
         "prompt": prompt,
         "stream": False
     }
-    print(f"[LOG] Sending description translation request to API: {api_url}")
+    logging.debug("Sending description translation request to API: %s", api_url)
     try:
-        response = requests.post(api_url, json=payload)
-        response.raise_for_status()
-        data = response.json()
+        data = OLLAMA_CLIENT.generate(payload, api_url)
         translated_text = data.get("response", "").strip("")
-        print(f"[LOG] Description translation result: {translated_text}")
+        cache_store(cache_key, translated_text)
+        logging.debug("Description translation result: %.100s", translated_text)
         return replace_double_with_single_quotes(translated_text)
-    except requests.ConnectionError as e:
-        print("[ERROR] Could not connect to Ollama server. Please ensure the Ollama server is running and accessible.")
-        return "[Error] Ollama server connection issue. Please check the server."
     except requests.RequestException as e:
         print(f"[ERROR] Description translation failed: {e}")
         return f"[Error] {e}"
@@ -205,9 +683,13 @@ def translate_content(
     source_lang: str,
     target_lang: str,
     model: str,
-    api_url: str = TRANSLATION_API_URL
+    api_url: Optional[str] = None
 ) -> str:
-    print(f"[LOG] Translating content from {source_lang} to {target_lang}")
+    logging.debug("Translating content (%d chars) from %s to %s", len(content), source_lang, target_lang)
+    cache_key, cached = cache_lookup(content, source_lang, target_lang, model, CONTENT_TRANSLATION_PROMPT)
+    if cached is not None:
+        logging.info("Using cached content translation.")
+        return cached
     prompt = CONTENT_TRANSLATION_PROMPT.format(
         source_lang_full=LANGUAGE_NAMES[source_lang],
         source_lang_code=source_lang,
@@ -220,270 +702,1969 @@ def translate_content(
         "prompt": prompt,
         "stream": False
     }
-    print(f"[LOG] Sending content translation request to API: {api_url}")
+    logging.debug("Sending content translation request to API: %s", api_url)
     try:
-        response = requests.post(api_url, json=payload)
-        response.raise_for_status()
-        data = response.json()
+        data = OLLAMA_CLIENT.generate(payload, api_url)
         translated_text = data.get("response", "").strip("")
-        print(f"[LOG] Content translation result: {translated_text[:100]}... (truncated)")
+        cache_store(cache_key, translated_text)
+        logging.debug("Content translation result: %.100s... (truncated)", translated_text)
         return translated_text
-    except requests.ConnectionError as e:
-        print("[ERROR] Could not connect to Ollama server. Please ensure the Ollama server is running and accessible.")
-        return "[Error] Ollama server connection issue. Please check the server."
     except requests.RequestException as e:
         print(f"[ERROR] Content translation failed: {e}")
         return f"[Error] {e}"
 
+
+class StreamingQuoteCleaner:
+    """Applies clean_special_quotes to streamed text without breaking patterns split across chunks."""
+
+    def __init__(self, write):
+        self.write = write
+        self.pending = ""
+
+    def feed(self, chunk: str) -> None:
+        text = self.pending + chunk
+        held = len(text) - len(text.rstrip('."'))
+        self.pending = text[len(text) - held:] if held else ""
+        self.write(clean_special_quotes(text[:len(text) - held]))
+
+    def flush(self) -> None:
+        self.write(clean_special_quotes(self.pending))
+        self.pending = ""
+
+def stream_translate_content(
+    content: str,
+    source_lang: str,
+    target_lang: str,
+    model: str,
+    write,
+    api_url: Optional[str] = None
+) -> None:
+    """Like translate_content, but passes the cleaned translation to write() fragment by fragment.
+
+    Raises TranslationError if the stream fails or stalls part way.
+    """
+    logging.debug("Streaming content translation from %s to %s", source_lang, target_lang)
+    cleaner = StreamingQuoteCleaner(write)
+    cache_key, cached = cache_lookup(content, source_lang, target_lang, model, CONTENT_TRANSLATION_PROMPT)
+    if cached is not None:
+        cleaner.feed(cached)
+        cleaner.flush()
+        return
+    prompt = CONTENT_TRANSLATION_PROMPT.format(
+        source_lang_full=LANGUAGE_NAMES[source_lang],
+        source_lang_code=source_lang,
+        target_lang_full=LANGUAGE_NAMES[target_lang],
+        target_lang_code=target_lang,
+        text=content
+    )
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": True
+    }
+    try:
+        OLLAMA_CLIENT.generate_stream(payload, api_url, on_chunk=cleaner.feed, stall_timeout=STALL_TIMEOUT)
+    except requests.RequestException as e:
+        # Part of the body is already written; fail so the caller discards the .part file
+        raise TranslationError(f"Content translation stream failed: {e}") from e
+    cleaner.flush()
+
+# Packing short fields from many posts into shared Ollama requests
+def estimate_tokens(text: str) -> int:
+    """Rough model token count: about four characters per token, never zero."""
+    return len(text) // 4 + 1
+
+# Field translators whose short inputs can share a packed request, and the post-processing each applies
+PACKABLE_FIELDS = {
+    translate_title: replace_double_with_single_quotes,
+    translate_description: replace_double_with_single_quotes,
+    translate_content: lambda text: text,
+}
+
+class SegmentPacker:
+    """Groups short field translations, from one post or many, into one JSON-numbered request per language.
+
+    Requests queue for `linger` seconds or until the group reaches `token_budget` estimated tokens or
+    `max_items` items. Items the model leaves out or answers with something other than a string fall back
+    to their own request.
+    """
+
+    def __init__(self, token_budget: int = 512, max_items: int = 32, linger: float = 0.02):
+        self.token_budget = token_budget
+        self.max_items = max_items
+        self.linger = linger
+        self.groups = {}  # (source, target, model) -> [(translate_fn, text, future), ...]
+        self.stats = {"items": 0, "requests": 0, "fallbacks": 0}
+
+    async def translate(self, translate_fn, text: str, source_lang: str, target_lang: str, model: str) -> str:
+        """Translate text as translate_fn would, sharing a request with other queued fields where possible."""
+        cache_key, cached = cache_lookup(text, source_lang, target_lang, model, PACKED_TRANSLATION_PROMPT)
+        if cached is not None:
+            return PACKABLE_FIELDS[translate_fn](cached)
+        if estimate_tokens(text) > self.token_budget // 2:
+            return await asyncio.to_thread(translate_fn, text, source_lang, target_lang, model)
+        self.stats["items"] += 1
+        group_key = (source_lang, target_lang, model)
+        group = self.groups.setdefault(group_key, [])
+        if group and sum(estimate_tokens(queued) for _, queued, _ in group) + estimate_tokens(text) > self.token_budget:
+            self._flush(group_key)
+            group = self.groups.setdefault(group_key, [])
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        group.append((translate_fn, text, future))
+        if len(group) == 1:
+            loop.call_later(self.linger, self._flush, group_key, group)
+        if len(group) >= self.max_items:
+            self._flush(group_key)
+        translated, packed = await future
+        if packed:
+            cache_store(cache_key, translated)
+        return PACKABLE_FIELDS[translate_fn](translated) if packed else translated
+
+    def _flush(self, group_key: tuple, expected: Optional[list] = None) -> None:
+        """Send the queued group, unless the timer fires for a group that was already sent."""
+        group = self.groups.get(group_key)
+        if not group or (expected is not None and group is not expected):
+            return
+        del self.groups[group_key]
+        asyncio.ensure_future(self._send(group_key, group))
+
+    async def _send(self, group_key: tuple, group: list) -> None:
+        source_lang, target_lang, model = group_key
+        CURRENT_FILE.set("-")
+        items = {str(number): text for number, (_, text, _) in enumerate(group, 1)}
+        prompt = PACKED_TRANSLATION_PROMPT.format(
+            source_lang_full=LANGUAGE_NAMES[source_lang],
+            source_lang_code=source_lang,
+            target_lang_full=LANGUAGE_NAMES[target_lang],
+            target_lang_code=target_lang,
+            items=json.dumps(items, ensure_ascii=False, indent=1)
+        )
+        payload = {"model": model, "prompt": prompt, "format": "json", "stream": False}
+        translations = {}
+        self.stats["requests"] += 1
+        try:
+            with stage("packed", len(prompt.encode("utf-8"))):
+                data = await asyncio.to_thread(OLLAMA_CLIENT.generate, payload)
+            translations = json.loads(data.get("response", ""))
+            if not isinstance(translations, dict):
+                raise ValueError("response is not a JSON object")
+        except (requests.RequestException, ValueError) as e:
+            logging.warning(f"Packed request of {len(group)} items failed ({e}); translating them one by one.")
+            translations = {}
+        except Exception as e:
+            for _, _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        fallbacks = []
+        for number, (translate_fn, text, future) in enumerate(group, 1):
+            translated = translations.get(str(number))
+            if isinstance(translated, str) and translated.strip():
+                future.set_result((" ".join(translated.split()), True))
+            else:
+                fallbacks.append((translate_fn, text, future))
+        if fallbacks:
+            self.stats["fallbacks"] += len(fallbacks)
+            logging.info(f"{len(fallbacks)} of {len(group)} packed items fall back to individual requests.")
+        outcomes = await asyncio.gather(
+            *(asyncio.to_thread(translate_fn, text, source_lang, target_lang, model) for translate_fn, text, _ in fallbacks),
+            return_exceptions=True,
+        )
+        for (_, _, future), outcome in zip(fallbacks, outcomes):
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result((outcome, False))
+
+# Set by main_cli when --pack is given
+PACKER: Optional[SegmentPacker] = None
+
+# Structure-aware Markdown segmentation
+FENCE_RE = re.compile(r"^\s*(`{3,}|~{3,})")
+HEADING_RE = re.compile(r"^(#{1,6}\s+)(.*?)(\s*)$", re.S)
+LIST_ITEM_RE = re.compile(r"^(\s*(?:[-*+]|\d+[.)])\s+(?:\[[ xX]\]\s+)?)(.*?)(\s*)$", re.S)
+BLOCKQUOTE_RE = re.compile(r"^((?:\s*>\s?)+)(.*?)(\s*)$", re.S)
+RULE_RE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+TABLE_SEPARATOR_RE = re.compile(r"^\s*\|?(\s*:?-+:?\s*\|)+\s*:?-*:?\s*\|?\s*$")
+HTML_BLOCK_RE = re.compile(r"^\s*(<[A-Za-z!/]|\{\{[<%])")
+INDENTED_CODE_RE = re.compile(r"^( {4}|\t)")
+PROTECTED_SPAN_RE = re.compile(
+    r"`+[^`]*`+"                                 # inline code
+    r"|\{\{[<%].*?[%>]\}\}"                      # Hugo shortcodes
+    r"|(?<=\])\([^)\s]*(?:\s+\"[^\"]*\")?\)"     # link and image targets
+    r"|\]\[[^\]]*\]"                             # reference-style link labels
+    r"|<[^>\n]+>"                                # inline HTML and autolinks
+    r"|https?://[^\s)>\]]*[^\s)>\].,;:!?'\"]"    # bare URLs, minus trailing punctuation
+    r"|(?<!\\)\|"                                # table cell separators
+)
+PLACEHOLDER_RE = re.compile(r"@@(\d+)@@")
+
+class MarkdownSegment:
+    """A block of a Markdown body. Only translatable segments are sent to the model."""
+
+    def __init__(self, kind: str, text: str, prefix: str = "", suffix: str = "", translatable: bool = False):
+        self.kind = kind
+        self.prefix = prefix
+        self.text = text
+        self.suffix = suffix
+        self.translatable = translatable
+
+    def render(self, text: Optional[str] = None) -> str:
+        return self.prefix + (self.text if text is None else text) + self.suffix
+
+def _prose_segment(kind: str, block: str, pattern: Optional[re.Pattern] = None) -> MarkdownSegment:
+    """Split a prose block into its Markdown prefix, translatable text and trailing whitespace."""
+    match = pattern.match(block) if pattern else re.match(r"^(\s*)(.*?)(\s*)$", block, re.S)
+    prefix, text, suffix = match.group(1), match.group(2), match.group(3)
+    return MarkdownSegment(kind, text, prefix, suffix, translatable=bool(text.strip()))
+
+def segment_markdown(content: str) -> list:
+    """Split a Markdown body into headings, paragraphs, list items, quotes, code, tables and HTML blocks."""
+    lines = content.splitlines(keepends=True)
+    segments = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        fence = FENCE_RE.match(line)
+        if fence:
+            marker = fence.group(1)
+            j = i + 1
+            while j < len(lines) and not lines[j].strip().startswith(marker):
+                j += 1
+            j = min(j + 1, len(lines))
+            segments.append(MarkdownSegment("code", "".join(lines[i:j])))
+            i = j
+        elif not stripped:
+            segments.append(MarkdownSegment("blank", line))
+            i += 1
+        elif INDENTED_CODE_RE.match(line) and (not segments or segments[-1].kind in ("blank", "code")) \
+                and not any(seg.kind == "list_item" for seg in segments[-2:]):
+            j = i
+            while j < len(lines) and (INDENTED_CODE_RE.match(lines[j]) or not lines[j].strip()):
+                j += 1
+            segments.append(MarkdownSegment("code", "".join(lines[i:j])))
+            i = j
+        elif HTML_BLOCK_RE.match(line):
+            j = i
+            while j < len(lines) and lines[j].strip():
+                j += 1
+            segments.append(MarkdownSegment("html", "".join(lines[i:j])))
+            i = j
+        elif stripped.startswith("|"):
+            j = i
+            while j < len(lines) and lines[j].strip().startswith("|"):
+                row = lines[j]
+                if TABLE_SEPARATOR_RE.match(row):
+                    segments.append(MarkdownSegment("table", row))
+                else:
+                    segments.append(_prose_segment("table", row))
+                j += 1
+            i = j
+        elif RULE_RE.match(line):
+            segments.append(MarkdownSegment("rule", line))
+            i += 1
+        elif HEADING_RE.match(line):
+            segments.append(_prose_segment("heading", line, HEADING_RE))
+            i += 1
+        elif LIST_ITEM_RE.match(line):
+            j = i + 1
+            while j < len(lines) and lines[j].strip() and lines[j][:1] in (" ", "\t") \
+                    and not LIST_ITEM_RE.match(lines[j]) and not FENCE_RE.match(lines[j]):
+                j += 1
+            segments.append(_prose_segment("list_item", "".join(lines[i:j]), LIST_ITEM_RE))
+            i = j
+        elif BLOCKQUOTE_RE.match(line):
+            segments.append(_prose_segment("blockquote", line, BLOCKQUOTE_RE))
+            i += 1
+        else:
+            j = i + 1
+            while j < len(lines) and lines[j].strip() and not any(
+                pattern.match(lines[j]) for pattern in (FENCE_RE, HEADING_RE, LIST_ITEM_RE, BLOCKQUOTE_RE, HTML_BLOCK_RE, RULE_RE)
+            ) and not lines[j].strip().startswith("|"):
+                j += 1
+            segments.append(_prose_segment("paragraph", "".join(lines[i:j])))
+            i = j
+    return segments
+
+def mask_protected_spans(text: str) -> tuple:
+    """Replace inline code, URLs, link targets, shortcodes and inline HTML with @@N@@ placeholders."""
+    spans = []
+    def substitute(match: re.Match) -> str:
+        spans.append(match.group(0))
+        return f"@@{len(spans) - 1}@@"
+    return PROTECTED_SPAN_RE.sub(substitute, text), spans
+
+def unmask_protected_spans(text: str, spans: list) -> Optional[str]:
+    """Restore placeholders; returns None if the model dropped, duplicated or invented any."""
+    found = PLACEHOLDER_RE.findall(text)
+    if sorted(int(index) for index in found) != list(range(len(spans))):
+        return None
+    return PLACEHOLDER_RE.sub(lambda match: spans[int(match.group(1))], text)
+
+def strip_wrapping_quotes(original: str, translated: str) -> str:
+    """Drop the quotes the prompt puts around the text if the model echoed them back."""
+    translated = translated.strip()
+    if len(translated) >= 2 and translated[0] == translated[-1] == '"' and not original.startswith('"'):
+        return translated[1:-1].strip()
+    return translated
+
+def translate_segment(
+    segment: str,
+    source_lang: str,
+    target_lang: str,
+    model: str,
+    api_url: Optional[str] = None,
+    glossary_hint: str = ""
+) -> str:
+    logging.debug("Translating segment (%d chars) from %s to %s", len(segment), source_lang, target_lang)
+    cache_key, cached = cache_lookup(segment, source_lang, target_lang, model, SEGMENT_TRANSLATION_PROMPT + glossary_hint)
+    if cached is not None:
+        return cached
+    prompt = SEGMENT_TRANSLATION_PROMPT.format(
+        source_lang_full=LANGUAGE_NAMES[source_lang],
+        source_lang_code=source_lang,
+        target_lang_full=LANGUAGE_NAMES[target_lang],
+        target_lang_code=target_lang,
+        glossary=glossary_hint,
+        text=segment
+    )
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": False
+    }
+    try:
+        if STREAM_OUTPUT:
+            data = OLLAMA_CLIENT.generate_stream(payload, api_url, stall_timeout=STALL_TIMEOUT)
+        else:
+            data = OLLAMA_CLIENT.generate(payload, api_url)
+        translated_text = strip_wrapping_quotes(segment, data.get("response", ""))
+        # Only cache responses that kept every placeholder; a corrupted one must be asked for again
+        if sorted(PLACEHOLDER_RE.findall(translated_text)) == sorted(PLACEHOLDER_RE.findall(segment)):
+            cache_store(cache_key, translated_text)
+        return translated_text
+    except requests.RequestException as e:
+        # An error string would pass the placeholder check and be written into the body
+        raise TranslationError(f"Segment translation failed: {e}") from e
+
+def keep_outer_whitespace(source: str, translated: str) -> str:
+    """Give translated the leading and trailing whitespace of source, which models tend to drop."""
+    stripped = source.strip()
+    if not stripped:
+        return source
+    start = source.index(stripped)
+    return source[:start] + translated.strip() + source[start + len(stripped):]
+
+def split_prose(text: str, token_budget: int) -> list:
+    """Split text at sentence ends into pieces of at most token_budget estimated tokens; "".join restores it."""
+    pieces = [""]
+    for sentence in re.split(r"(?<=[.!?])(?=\s)", text):
+        if pieces[-1] and estimate_tokens(pieces[-1] + sentence) > token_budget:
+            pieces.append("")
+        pieces[-1] += sentence
+    return pieces
+
+def chunk_markdown(content: str, token_budget: int) -> list:
+    """Group whole Markdown blocks into chunks of at most token_budget estimated tokens; "".join restores content.
+
+    A block larger than the budget becomes a chunk of its own, and table rows are never split apart.
+    """
+    chunks = [""]
+    previous_kind = ""
+    for segment in segment_markdown(content):
+        block = segment.render()
+        splittable = segment.kind != "blank" and not (segment.kind == previous_kind == "table")
+        if chunks[-1].strip() and splittable and estimate_tokens(chunks[-1] + block) > token_budget:
+            chunks.append("")
+        chunks[-1] += block
+        previous_kind = segment.kind
+    return chunks
+
+def count_fences(text: str) -> int:
+    return sum(1 for line in text.splitlines() if FENCE_RE.match(line))
+
+def chunk_is_complete(chunk: str, translated: str) -> bool:
+    """A translated chunk is accepted when it is non-empty and keeps as many code fences as the source."""
+    return bool(translated.strip()) and not translated.startswith("[Error]") and count_fences(translated) == count_fences(chunk)
+
+def translate_chunk(chunk: str, index: int, total: int, source_lang: str, target_lang: str, model: str) -> str:
+    """Translate one chunk of a whole-document translation, retrying once if it comes back truncated."""
+    translated = translate_content(chunk, source_lang, target_lang, model)
+    for attempt in range(2):
+        if chunk_is_complete(chunk, translated):
+            return keep_outer_whitespace(chunk, translated)
+        if attempt == 0:
+            logging.warning(f"Chunk {index + 1}/{total} looks truncated; retrying it once.")
+            CACHE_BYPASS.set(True)
+            translated = translate_content(chunk, source_lang, target_lang, model)
+    raise TranslationError(f"Chunk {index + 1}/{total} of the body was truncated or lost its code blocks")
+
+async def translate_chunked_content(content: str, source_lang: str, target_lang: str, model: str) -> str:
+    """Translate a whole Markdown body chunk by chunk, concurrently, and stitch the chunks back in order."""
+    chunks = chunk_markdown(content, CHUNK_TOKENS)
+    if len(chunks) > 1:
+        logging.info(f"Split body into {len(chunks)} chunks of at most ~{CHUNK_TOKENS} tokens.")
+    translated = await asyncio.gather(*(
+        asyncio.to_thread(translate_chunk, chunk, index, len(chunks), source_lang, target_lang, model)
+        for index, chunk in enumerate(chunks)
+    ))
+    return "".join(translated)
+
+# Set per output by translate_if_changed; collects the prose blocks that had to stay in the source language
+KEPT_SOURCE_BLOCKS = contextvars.ContextVar("KEPT_SOURCE_BLOCKS", default=None)
+
+def translate_prose_segment(segment: MarkdownSegment, source_lang: str, target_lang: str, model: str) -> str:
+    """Translate one prose segment with its protected spans masked, keeping the source if placeholders break.
+
+    A segment whose placeholders come back corrupted is retried once, bypassing the cache. Segments over
+    CHUNK_TOKENS are translated a few sentences at a time.
+    """
+    masked, spans = mask_protected_spans(segment.text)
+    if not re.search(r"[^\W\d_]", PLACEHOLDER_RE.sub("", masked)):
+        return segment.text
+    glossary = get_glossary()
+    if not spans:
+        covered = glossary.translate_phrase(segment.text, target_lang)
+        if covered is not None:
+            return covered
+    for attempt in range(2):
+        translated = "".join(
+            keep_outer_whitespace(piece, translate_segment(
+                piece, source_lang, target_lang, model,
+                glossary_hint=glossary.prompt_hint(PLACEHOLDER_RE.sub(" ", piece), target_lang)))
+            for piece in split_prose(masked, CHUNK_TOKENS)
+        )
+        restored = unmask_protected_spans(translated, spans)
+        if restored is not None:
+            return clean_special_quotes(restored)
+        if attempt == 0:
+            logging.info(f"Model corrupted placeholders in {segment.kind} segment; retrying it once.")
+            CACHE_BYPASS.set(True)
+    logging.warning(f"Model corrupted placeholders in {segment.kind} segment; keeping source text: {segment.text[:60]}")
+    kept_source = KEPT_SOURCE_BLOCKS.get()
+    if kept_source is not None:
+        kept_source.append(segment.text)
+    return segment.text
+
+async def translate_markdown_body(content: str, source_lang: str, target_lang: str, model: str,
+                                  segments: Optional[list] = None) -> str:
+    """Translate only the prose blocks of a Markdown body and reassemble it around the untouched blocks.
+
+    Pass segments to reuse a segmentation of content shared by several target languages.
+    """
+    if not content:
+        return ""
+    if not SEGMENT_MARKDOWN:
+        return clean_special_quotes(await translate_chunked_content(content, source_lang, target_lang, model))
+    if segments is None:
+        segments = segment_markdown(content)
+    unique_texts = list(dict.fromkeys(segment.text for segment in segments if segment.translatable))
+    logging.info(f"Segmented body into {len(segments)} blocks, {len(unique_texts)} unique prose blocks.")
+    by_text = {segment.text: segment for segment in segments if segment.translatable}
+    translated = await asyncio.gather(*(
+        asyncio.to_thread(translate_prose_segment, by_text[text], source_lang, target_lang, model)
+        for text in unique_texts
+    ))
+    translations = dict(zip(unique_texts, translated))
+    return "".join(
+        segment.render(translations[segment.text]) if segment.translatable else segment.render()
+        for segment in segments
+    )
+
+async def stream_markdown_body(content: str, write, source_lang: str, target_lang: str, model: str,
+                               segments: Optional[list] = None) -> None:
+    """Translate a Markdown body and write it in document order as soon as each part is ready."""
+    if not SEGMENT_MARKDOWN:
+        chunks = chunk_markdown(content, CHUNK_TOKENS)
+        if len(chunks) == 1:
+            # Already written as it streamed, so a truncated response cannot be retried, only failed
+            streamed = []
+            def tee(text: str) -> None:
+                streamed.append(text)
+                write(text)
+            await asyncio.to_thread(stream_translate_content, content, source_lang, target_lang, model, tee)
+            if not chunk_is_complete(content, "".join(streamed)):
+                raise TranslationError("The streamed body was truncated or lost its code blocks")
+            return
+        # Too long for one prompt: translate the chunks concurrently and write each as its turn comes
+        tasks = [asyncio.ensure_future(asyncio.to_thread(translate_chunk, chunk, index, len(chunks), source_lang, target_lang, model))
+                 for index, chunk in enumerate(chunks)]
+        for task in tasks:
+            write(clean_special_quotes(await task))
+        return
+    # Keep at most one Ollama slot's worth of blocks in flight ahead of the write position
+    window = deque()
+    async def flush_head() -> None:
+        segment, task = window.popleft()
+        write(segment.render(await task) if task is not None else segment.render())
+    for segment in segments if segments is not None else segment_markdown(content):
+        task = None
+        if segment.translatable:
+            task = asyncio.ensure_future(asyncio.to_thread(translate_prose_segment, segment, source_lang, target_lang, model))
+        window.append((segment, task))
+        while sum(1 for _, pending in window if pending is not None) > OLLAMA_CLIENT.max_inflight:
+            await flush_head()
+    while window:
+        await flush_head()
+
+# Offline transliteration with one backend per language, resolved once
+def _load_devanagari_backend():
+    from indic_transliteration.sanscript import transliterate
+    return lambda text: transliterate(text, 'iast', 'devanagari')
+
+def _load_thai_backend():
+    from aksharamukha.transliterate import process
+    return lambda text: process('IAST', 'Thai', text)
+
+TRANSLITERATION_BACKENDS = {
+    "hi": ("indic-transliteration", _load_devanagari_backend),
+    "th": ("aksharamukha", _load_thai_backend),
+}
+LATIN_SCRIPT_LANGS = {"de", "fr", "it", "pt", "es"}
+
+class TransliterationEngine:
+    """Initialises each language's backend once and memoizes results in a bounded LRU."""
+
+    def __init__(self, cache_size: int = 4096):
+        self.cache_size = cache_size
+        self._backends = {}
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    def backend(self, lang_code: str):
+        """Return the transliteration function for lang_code, or None if there is none. Problems are reported once."""
+        if lang_code in self._backends:
+            return self._backends[lang_code]
+        backend = None
+        if lang_code in LATIN_SCRIPT_LANGS:
+            backend = lambda text: text
+        elif lang_code in TRANSLITERATION_BACKENDS:
+            package, loader = TRANSLITERATION_BACKENDS[lang_code]
+            try:
+                backend = loader()
+            except ImportError:
+                print(f"[ERROR] Please install {package} for {LANGUAGE_NAMES[lang_code]} transliteration: pip install {package}")
+        else:
+            print(f"[WARN] Transliteration for language code '{lang_code}' is not supported. Returning original text.")
+        self._backends[lang_code] = backend
+        return backend
+
+    def warm_up(self, lang_codes: list) -> dict:
+        """Resolve the backends for lang_codes up front; returns {lang_code: available}."""
+        return {lang_code: self.backend(lang_code) is not None for lang_code in lang_codes}
+
+    def transliterate(self, text: str, lang_code: str) -> str:
+        backend = self.backend(lang_code)
+        if backend is None or lang_code in LATIN_SCRIPT_LANGS:
+            return text
+        key = (lang_code, text)
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+        result = backend(text)
+        with self._lock:
+            self._memo[key] = result
+            if len(self._memo) > self.cache_size:
+                self._memo.popitem(last=False)
+        return result
+
+    def transliterate_many(self, texts: list, lang_code: str) -> list:
+        return [self.transliterate(text, lang_code) for text in texts]
+
+TRANSLITERATION = TransliterationEngine()
+
 def transliterate_to_script(text: str, lang_code: str) -> str:
     """
     Transliterate English text into the script of the target language, preserving pronunciation.
     Supports Hindi (hi, Devanagari) and Thai (th, Thai script). Returns original for Latin-alphabet languages.
     """
-    latin_langs = {"de", "fr", "it", "pt", "es"}
-    if lang_code in latin_langs:
-        return text
-    if lang_code == "hi":
+    return TRANSLITERATION.transliterate(text, lang_code)
+
+# Glossary compiled from every translations/translations_<lang>.csv
+TERM_TOKEN_RE = re.compile(r"\w(?:[\w.\-/']*\w)?[+#]*")
+ABBREVIATION_RE = re.compile(r"^(.+?)\s*\((.+)\)$")
+GLOSSARY_END = "\0"
+
+def read_glossary_csv(csv_path: str) -> dict:
+    """Read one word,translation CSV, tolerating text before the header and unquoted commas in rows."""
+    entries = {}
+    with open(csv_path, newline='', encoding='utf-8') as csvfile:
+        rows = csv.reader(csvfile)
+        for row in rows:
+            if [cell.strip().lower() for cell in row] == ["word", "translation"]:
+                break
+        else:
+            logging.warning(f"No 'word,translation' header in {csv_path}. Skipping.")
+            return entries
+        for row in rows:
+            if len(row) < 2:
+                continue
+            # "ETL (Extract, Transform, Load),ETL (...)" arrives as six cells: split them evenly
+            half = len(row) // 2 if len(row) % 2 == 0 else 1
+            word = ",".join(row[:half]).strip()
+            translation = ",".join(row[half:]).strip()
+            if word and translation:
+                entries[word.lower()] = translation
+    # "API (Application Programming Interface)" also answers for "API" and for its expansion
+    for word, translation in list(entries.items()):
+        word_match, translation_match = ABBREVIATION_RE.match(word), ABBREVIATION_RE.match(translation)
+        if word_match and translation_match:
+            entries.setdefault(word_match.group(1).strip(), translation_match.group(1).strip())
+            entries.setdefault(word_match.group(2).strip(), translation_match.group(2).strip())
+    return entries
+
+class Glossary:
+    """Per-language term index with longest-phrase matching, cached in binary form until a CSV changes."""
+
+    def __init__(self, entries: dict):
+        self.entries = entries
+        self.tries = {lang: self._build_trie(terms) for lang, terms in entries.items()}
+
+    @staticmethod
+    def _build_trie(terms: dict) -> dict:
+        trie = {}
+        for term, translation in terms.items():
+            node = trie
+            for token in TERM_TOKEN_RE.findall(term):
+                node = node.setdefault(token, {})
+            node[GLOSSARY_END] = translation
+        return trie
+
+    @classmethod
+    def load(cls, base_path: str = "translations", cache_dir: Optional[str] = ".marklang_cache") -> "Glossary":
+        """Load every CSV under base_path, reusing the pickled index if no CSV has changed.
+
+        With cache_dir None the index is compiled in memory only.
+        """
+        csv_paths = sorted(glob.glob(os.path.join(base_path, "translations_*.csv")))
+        signature = [(path, os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in csv_paths]
+        cache_path = os.path.join(cache_dir, "glossary.pickle") if cache_dir else None
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "rb") as f:
+                    cached_signature, glossary = pickle.load(f)
+                if cached_signature == signature:
+                    logging.info(f"Loaded glossary index for {sorted(glossary.entries)} from {cache_path}.")
+                    return glossary
+            except (OSError, pickle.PickleError, EOFError, ValueError, AttributeError) as e:
+                logging.warning(f"Ignoring unreadable glossary cache {cache_path}: {e}")
+        entries = {}
+        for path in csv_paths:
+            lang = os.path.basename(path)[len("translations_"):-len(".csv")]
+            entries[lang] = read_glossary_csv(path)
+            logging.info(f"Loaded {len(entries[lang])} custom dictionary entries from {path}.")
+        glossary = cls(entries)
+        if not cache_path:
+            return glossary
         try:
-            from indic_transliteration.sanscript import transliterate
-            return transliterate(text, 'iast', 'devanagari')
-        except ImportError:
-            print("[ERROR] Please install indic-transliteration for Hindi transliteration: pip install indic-transliteration")
-            return text
-    if lang_code == "th":
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(f"{cache_path}.tmp", "wb") as f:
+                pickle.dump((signature, glossary), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(f"{cache_path}.tmp", cache_path)
+        except OSError as e:
+            logging.warning(f"Could not write glossary cache {cache_path}: {e}")
+        return glossary
+
+    def lookup(self, term: str, lang: str) -> Optional[str]:
+        """Exact, case-insensitive glossary lookup."""
+        return self.entries.get(lang, {}).get(term.strip().lower())
+
+    def find_terms(self, text: str, lang: str) -> list:
+        """Return (start, end, translation) for the leftmost-longest glossary phrases in text."""
+        trie = self.tries.get(lang)
+        if not trie:
+            return []
+        tokens = [(match.start(), match.end(), match.group(0).lower()) for match in TERM_TOKEN_RE.finditer(text)]
+        matches = []
+        i = 0
+        while i < len(tokens):
+            node, longest = trie, None
+            for j in range(i, len(tokens)):
+                node = node.get(tokens[j][2])
+                if node is None:
+                    break
+                if GLOSSARY_END in node:
+                    longest = (j, node[GLOSSARY_END])
+            if longest is None:
+                i += 1
+                continue
+            j, translation = longest
+            matches.append((tokens[i][0], tokens[j][1], translation))
+            i = j + 1
+        return matches
+
+    def translate_phrase(self, text: str, lang: str) -> Optional[str]:
+        """Translate text entirely from the glossary, or return None if any word is not covered."""
+        exact = self.lookup(text, lang)
+        if exact:
+            return exact
+        matches = self.find_terms(text, lang)
+        if not matches:
+            return None
+        pieces, position = [], 0
+        for start, end, translation in matches:
+            gap = text[position:start]
+            if TERM_TOKEN_RE.search(gap):
+                return None
+            pieces.extend([gap, translation])
+            position = end
+        if TERM_TOKEN_RE.search(text[position:]):
+            return None
+        pieces.append(text[position:])
+        return "".join(pieces)
+
+    def prompt_hint(self, text: str, lang: str) -> str:
+        """Format the glossary terms found in text as a prompt section, or "" if there are none."""
+        terms = {text[start:end]: translation for start, end, translation in self.find_terms(text, lang)}
+        if not terms:
+            return ""
+        return GLOSSARY_HINT.format(terms="\n".join(f"- {term} → {translation}" for term, translation in terms.items()))
+
+GLOSSARY: Optional[Glossary] = None
+GLOSSARY_CACHE_DIR: Optional[str] = ".marklang_cache"  # None with --no-cache
+
+GLOSSARY_LOCK = threading.Lock()
+
+def get_glossary(base_path: str = "translations") -> Glossary:
+    """Return the process-wide glossary, loading it on first use; worker threads wait for a single load."""
+    global GLOSSARY
+    glossary = GLOSSARY
+    if glossary is None:
+        with GLOSSARY_LOCK:
+            if GLOSSARY is None:
+                GLOSSARY = Glossary.load(base_path, GLOSSARY_CACHE_DIR)
+            glossary = GLOSSARY
+    return glossary
+
+def load_custom_dictionary(lang_code: str, base_path: str = "translations") -> dict:
+    """Load the glossary from base_path and return the custom dictionary entries for one language."""
+    entries = dict(get_glossary(base_path).entries.get(lang_code, {}))
+    if not entries:
+        logging.info(f"No custom dictionary entries for '{lang_code}' under '{base_path}'.")
+    return entries
+
+# Googletrans term translation shared by every post in a run
+class AsyncRateLimiter:
+    """Spaces out calls so that at most `rate` start per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+class TermTranslationService:
+    """Deduplicates tag, category and author terms case-insensitively and translates them in rate-limited batches."""
+
+    def __init__(self, translator, requests_per_second: float = 5.0, batch_size: int = 50,
+                 max_retries: int = 4, backoff: float = 1.0):
+        self.translator = translator
+        self.limiter = AsyncRateLimiter(requests_per_second)
+        self.batch_size = max(batch_size, 1)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.results = {}    # (lang, term.lower()) -> translation, or None when Googletrans gave nothing usable
+        self._inflight = {}  # (lang, term.lower()) -> future shared by every post waiting on that term
+        self.stats = {"terms": 0, "glossary_hits": 0, "cache_hits": 0, "requests": 0, "retries": 0, "failures": 0}
+
+    async def _call(self, text: str, lang: str) -> str:
+        """One rate-limited Googletrans request, retried with jittered exponential backoff."""
+        attempt = 0
+        while True:
+            await self.limiter.wait()
+            self.stats["requests"] += 1
+            try:
+                with stage("googletrans", len(text.encode("utf-8"))):
+                    return (await self.translator.translate(text, dest=lang)).text
+            except Exception as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                self.stats["retries"] += 1
+                delay = self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+                logging.warning(f"Googletrans request failed ({e}); retry {attempt}/{self.max_retries} in {delay:.1f}s.")
+                await asyncio.sleep(delay)
+
+    def _resolve(self, key: tuple, term: str, translated: Optional[str]) -> None:
+        lang = key[0]
+        if translated is not None and translated.strip().lower() == term.strip().lower():
+            logging.warning(f"Googletrans did not translate '{term}'. Using offline transliteration fallback.")
+            translated = None
+        if translated is not None:
+            cache_store(TranslationCache.make_key(term, "auto", lang, "googletrans", ""), translated)
+        self.results[key] = translated
+        future = self._inflight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(translated)
+
+    async def _translate_batch(self, keys: list, terms: dict, lang: str) -> None:
+        """Translate a batch in one newline-joined request, falling back to one request per term."""
+        batch = [terms[key] for key in keys]
         try:
-            from aksharamukha.transliterate import process
-            return process('IAST', 'Thai', text)
-        except ImportError:
-            print("[ERROR] Please install aksharamukha for Thai transliteration: pip install aksharamukha")
-            return text
-    print(f"[WARN] Transliteration for language code '{lang_code}' is not supported. Returning original text.")
-    return text
+            if len(batch) > 1:
+                lines = (await self._call("\n".join(batch), lang)).split("\n")
+                if len(lines) == len(batch):
+                    for key, term, line in zip(keys, batch, lines):
+                        self._resolve(key, term, line.strip())
+                    return
+                logging.info(f"Googletrans batch of {len(batch)} came back with {len(lines)} lines; translating one by one.")
+            for key, term in zip(keys, batch):
+                try:
+                    self._resolve(key, term, await self._call(term, lang))
+                except Exception as e:
+                    logging.warning(f"Googletrans failed for '{term}': {e}. Using offline transliteration fallback.")
+                    self.stats["failures"] += 1
+                    self._resolve(key, term, None)
+        except Exception as e:
+            logging.warning(f"Googletrans batch failed: {e}. Using offline transliteration fallback.")
+            self.stats["failures"] += len(batch)
+            for key, term in zip(keys, batch):
+                self._resolve(key, term, None)
 
-# Load custom dictionary from CSV
-CUSTOM_DICT = {}
-def load_custom_dictionary(lang_code: str, base_path: str = "translations") -> None:
-    """Load a custom dictionary for the target language from a CSV file."""
-    global CUSTOM_DICT
-    CUSTOM_DICT = {}
-    csv_path = os.path.join(base_path, f"translations_{lang_code}.csv")
-    logging.info(f"Attempting to load custom dictionary: {csv_path}")
-    if not os.path.exists(csv_path):
-        logging.info(f"Custom dictionary CSV '{csv_path}' not found. Skipping.")
-        return
-    with open(csv_path, newline='', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            word = row['word'].strip()
-            translation = row['translation'].strip()
-            CUSTOM_DICT[word.lower()] = translation
-    logging.info(f"Loaded {len(CUSTOM_DICT)} custom dictionary entries from {csv_path}.")
+    async def prefetch(self, terms: list, lang: str) -> None:
+        """Resolve every distinct term, sending only those not in the glossary or cache to Googletrans."""
+        loop = asyncio.get_running_loop()
+        missing = {}
+        waiting = []
+        glossary = get_glossary()
+        for term in terms:
+            key = (lang, term.strip().lower())
+            if not key[1] or key in self.results or key in missing:
+                continue
+            if key in self._inflight:
+                waiting.append(self._inflight[key])
+                continue
+            self.stats["terms"] += 1
+            custom = glossary.translate_phrase(term, lang)
+            if custom:
+                logging.info(f"Using custom dictionary translation for '{term}' in '{lang}': {custom} (from translations_{lang}.csv)")
+                self.stats["glossary_hits"] += 1
+                self.results[key] = custom
+                continue
+            _, cached = cache_lookup(term, "auto", lang, "googletrans", "")
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                self.results[key] = cached
+                continue
+            missing[key] = term
+            self._inflight[key] = loop.create_future()
+        keys = list(missing)
+        await asyncio.gather(*(
+            self._translate_batch(keys[i:i + self.batch_size], missing, lang)
+            for i in range(0, len(keys), self.batch_size)
+        ), *waiting)
+
+    async def translate_terms(self, terms: list, lang: str) -> list:
+        """Translate terms, falling back to transliteration for any Googletrans could not handle."""
+        await self.prefetch(terms, lang)
+        results = [self.results.get((lang, term.strip().lower())) for term in terms]
+        fallbacks = iter(TRANSLITERATION.transliterate_many([term for term, result in zip(terms, results) if result is None], lang))
+        return [result if result is not None else next(fallbacks) for result in results]
+
+# Created on first use; main_cli sizes it from the command line
+TERM_SERVICE: Optional[TermTranslationService] = None
+GOOGLETRANS_RPS = 5.0
+GOOGLETRANS_BATCH_SIZE = 50
+
+def get_term_service(translator) -> TermTranslationService:
+    """Return the run-wide term service for translator."""
+    global TERM_SERVICE
+    if TERM_SERVICE is None or TERM_SERVICE.translator is not translator:
+        TERM_SERVICE = TermTranslationService(translator, GOOGLETRANS_RPS, GOOGLETRANS_BATCH_SIZE)
+    return TERM_SERVICE
 
 async def translate_single_word(translator, word: str, target_lang: str) -> str:
     """Translate a single word using custom dictionary, Googletrans, or offline transliteration."""
-    custom = CUSTOM_DICT.get(word.lower())
-    if custom:
-        logging.info(f"Using custom dictionary translation for '{word}' in '{target_lang}': {custom} (from translations_{target_lang}.csv)")
-        return custom
-    try:
-        translation = await translator.translate(word, dest=target_lang)
-        if translation.text.strip().lower() == word.strip().lower():
-            logging.warning(f"Googletrans did not translate '{word}'. Using offline transliteration fallback.")
-            return transliterate_to_script(word, target_lang)
-        return translation.text
-    except Exception as e:
-        logging.warning(f"Googletrans failed for '{word}': {e}. Using offline transliteration fallback.")
-        return transliterate_to_script(word, target_lang)
+    return (await get_term_service(translator).translate_terms([word], target_lang))[0]
 
 async def translate_array_with_googletrans(translator, array: list, target_lang: str) -> list:
-    """Translate an array of words using translate_single_word."""
-    tasks = [translate_single_word(translator, word, target_lang) for word in array]
-    return await asyncio.gather(*tasks)
+    """Translate an array of words in deduplicated, rate-limited batches."""
+    return await get_term_service(translator).translate_terms(list(array), target_lang)
 
 async def translate_author_with_transliteration(translator, author: str, target_lang: str) -> str:
     """Translates and transliterates the author field if needed."""
     if not author:
         return author
+    logging.info(f"Transliterating author: {author}")
     # Try custom dictionary or Googletrans, then transliterate if needed
-    translated = await translate_single_word(translator, author, target_lang)
-    return transliterate_to_script(translated, target_lang)
+    with stage("author"):
+        translated = await translate_single_word(translator, author, target_lang)
+    with stage("transliteration"):
+        return transliterate_to_script(translated, target_lang)
+
+def split_terms(value) -> list:
+    """Normalise a tags/categories value, which may be a list or a comma-separated string."""
+    if isinstance(value, str):
+        return [term.strip() for term in value.split(",") if term.strip()]
+    return list(value or [])
+
+async def translate_terms(terms: list, target_lang: str, label: str) -> list:
+    """Translate and transliterate tags or categories."""
+    if not terms:
+        return []
+    logging.info(f"Translating {label} from {LANGUAGE_NAMES[SOURCE_LANG]} ({SOURCE_LANG}) to {LANGUAGE_NAMES[target_lang]} ({target_lang})...")
+    with stage(label):
+        translated = await translate_array_with_googletrans(translator, terms, target_lang)
+    with stage("transliteration"):
+        translated = TRANSLITERATION.transliterate_many(translated, target_lang)
+    logging.debug("%s translated: %s", label.capitalize(), translated)
+    return translated
+
+async def translate_text_field(translate_fn, text: str, label: str, target_lang: str) -> str:
+    """Run one blocking Ollama field translation on the worker pool; raises TranslationError if it failed."""
+    if not text:
+        return ""
+    logging.info(f"Translating {label} to {target_lang}...")
+    with stage(label.lower().replace(" ", "_"), len(text.encode("utf-8"))):
+        if PACKER is not None and translate_fn in PACKABLE_FIELDS:
+            translated = await PACKER.translate(translate_fn, text, SOURCE_LANG, target_lang, TRANSLATION_MODEL)
+        else:
+            translated = await asyncio.to_thread(translate_fn, text, SOURCE_LANG, target_lang, TRANSLATION_MODEL)
+    # The field translators report request failures in-band; never write or record them as a translation
+    if translated.startswith("[Error]"):
+        raise TranslationError(f"Could not translate {label} to {target_lang}: {translated[len('[Error] '):]}")
+    logging.debug("%s translated: %.100s", label.capitalize(), translated)
+    return translated
+
+async def translate_body(content: str, target_lang: str, segments: Optional[list] = None) -> str:
+    """Translate the markdown body of a post, timed as the "body" stage."""
+    if not content:
+        return ""
+    with stage("body", len(content.encode("utf-8"))):
+        return await translate_markdown_body(content, SOURCE_LANG, target_lang, TRANSLATION_MODEL, segments)
+
+# Keys whose values are written as double-quoted strings
+QUOTED_FRONTMATTER_KEYS = ("title", "description", "summary", "author")
+
+# Fields translated by the model; tags, categories and author come from the memoized term service, so a
+# retry would return the same value
+RETRYABLE_FIELDS = ("title", "description", "summary")
+
+# Base delay before re-translating a field that failed validation; doubles on every attempt
+FIELD_RETRY_BACKOFF = 0.5
 
-def process_markdown(file_path: str, output_path: str = "output.md") -> None:
-    """Process a markdown file: translate frontmatter and content, write to output."""
+def render_frontmatter_line(key: str, value) -> Optional[str]:
+    """Render one metadata entry the way MarkLang writes it, or None if the key is omitted."""
+    if value is None:
+        return None
+    if key in QUOTED_FRONTMATTER_KEYS:
+        value = f'"{value}"'
+    if not (value or isinstance(value, bool)):
+        return None
+    return clean_frontmatter_value(f"{key}: {value}")
+
+async def translate_field_with_retries(key: str, translate, max_retries: int) -> tuple:
+    """Translate one frontmatter field until its line validates. Returns (value, attempts)."""
+    attempts = 0
+    while True:
+        attempts += 1
+        value = await translate()
+        line = render_frontmatter_line(key, value)
+        if line is None or frontmatter_line_is_valid(key, line):
+            return value, attempts
+        if attempts > max_retries:
+            raise FrontmatterValidationError(f"Field '{key}' failed validation after {attempts} attempts: {line}")
+        delay = FIELD_RETRY_BACKOFF * 2 ** (attempts - 1)
+        logging.warning(f"Field '{key}' failed validation (attempt {attempts}/{max_retries + 1}); retrying in {delay:.1f}s.")
+        await asyncio.sleep(delay)
+        CACHE_BYPASS.set(True)
+
+def load_post(file_path: str):
+    """Parse a source post, timed as the "parse" stage."""
     logging.info(f"Starting processing of markdown file: {file_path}")
     try:
-        post = frontmatter.load(file_path)
+        with stage("parse", os.path.getsize(file_path)):
+            post = frontmatter.load(file_path)
         logging.info("Successfully loaded markdown file.")
     except Exception as e:
-        logging.error(f"Failed to load markdown file: {e}")
-        return
+        raise TranslationError(f"Failed to load markdown file {file_path}: {e}") from e
+    return post
 
-    async def main(max_retries=5):
-        logging.info("Entered async main() for processing.")
-        retries = 0
-        while retries <= max_retries:
-            translated_title = ""
-            if RENDER_KEYS["title"]:
-                original_title = post.get("title")
-                logging.info(f"Original title: {original_title}")
-                if not original_title:
-                    logging.error("No title found in frontmatter.")
-                    return
-                logging.info("Translating title...")
-                translated_title = translate_title(original_title, SOURCE_LANG, TARGET_LANG, TRANSLATION_MODEL)
-                logging.info(f"Title translated: {translated_title}")
-
-            translated_description = ""
-            if RENDER_KEYS.get("description"):
-                original_description = post.get("description")
-                logging.info(f"Original description: {original_description}")
-                if original_description:
-                    logging.info("Translating description...")
-                    translated_description = translate_description(original_description, SOURCE_LANG, TARGET_LANG, TRANSLATION_MODEL)
-                    logging.info(f"Description translated: {translated_description}")
-
-            translated_summary = ""
-            if RENDER_KEYS.get("summary"):
-                original_summary = post.get("summary")
-                logging.info(f"Original summary: {original_summary}")
-                if original_summary:
-                    logging.info("Translating summary...")
-                    translated_summary = translate_description(original_summary, SOURCE_LANG, TARGET_LANG, TRANSLATION_MODEL)
-                    logging.info(f"Summary translated: {translated_summary}")
-
-            translated_tags = []
-            if RENDER_KEYS["tags"]:
-                original_tags = post.get("tags", [])
-                logging.info(f"Original tags: {original_tags} (type: {type(original_tags)})")
-                if isinstance(original_tags, str):
-                    original_tags = [tag.strip() for tag in original_tags.split(",") if tag.strip()]
-                if original_tags:
-                    logging.info(f"Translating tags from {LANGUAGE_NAMES[SOURCE_LANG]} ({SOURCE_LANG}) to {LANGUAGE_NAMES[TARGET_LANG]} ({TARGET_LANG})...")
-                    translated_tags = await translate_array_with_googletrans(translator, original_tags, TARGET_LANG)
-                    translated_tags = [transliterate_to_script(tag, TARGET_LANG) for tag in translated_tags]
-                    logging.info(f"Tags translated: {translated_tags}")
-
-            translated_categories = []
-            if RENDER_KEYS["categories"]:
-                original_categories = post.get("categories", [])
-                logging.info(f"Original categories: {original_categories} (type: {type(original_categories)})")
-                if isinstance(original_categories, str):
-                    original_categories = [cat.strip() for cat in original_categories.split(",") if cat.strip()]
-                if original_categories:
-                    logging.info(f"Translating categories from {LANGUAGE_NAMES[SOURCE_LANG]} ({SOURCE_LANG}) to {LANGUAGE_NAMES[TARGET_LANG]} ({TARGET_LANG})...")
-                    translated_categories = await translate_array_with_googletrans(translator, original_categories, TARGET_LANG)
-                    translated_categories = [transliterate_to_script(cat, TARGET_LANG) for cat in translated_categories]
-                    logging.info(f"Categories translated: {translated_categories}")
-
-            date = post.get("date", "")
-            draft = post.get("draft", "")
-
-            translated_author = ""
-            if RENDER_KEYS.get("author"):
-                original_author = post.get("author", "")
-                logging.info(f"Original author: {original_author}")
-                if original_author:
-                    logging.info("Transliterating author...")
-                    translated_author = await translate_author_with_transliteration(translator, original_author, TARGET_LANG)
-                    logging.info(f"Author transliterated: {translated_author}")
-
-            pinned = post.get("pinned", None)
-
-            logging.info("Creating new frontmatter...")
-            new_metadata = {
-                "title": f'"{translated_title}"' if RENDER_KEYS["title"] else None,
-                "description": f'"{translated_description}"' if RENDER_KEYS.get("description") else None,
-                "summary": f'"{translated_summary}"' if RENDER_KEYS.get("summary") else None,
-                "tags": translated_tags if RENDER_KEYS["tags"] else None,
-                "categories": translated_categories if RENDER_KEYS["categories"] else None,
-                "date": date if RENDER_KEYS["date"] else None,
-                "draft": draft if RENDER_KEYS["draft"] else None,
-                "author": f'"{translated_author}"' if RENDER_KEYS.get("author") and translated_author else None,
-                "pinned": pinned if RENDER_KEYS.get("pinned") and pinned is not None else None
-            }
-            logging.info(f"New metadata for frontmatter: {new_metadata}")
-            new_frontmatter = "---\n" + "\n".join(f"{key}: {value}" for key, value in new_metadata.items() if value or isinstance(value, bool)) + "\n---\n"
-            new_frontmatter = clean_frontmatter_value(new_frontmatter)
-            logging.info(f"New frontmatter generated:\n{new_frontmatter}")
+async def translate_post(post, file_path: str, output_path: str, target_lang: str, max_retries: int = 5,
+                         segments: Optional[list] = None) -> int:
+    """Translate an already parsed post into target_lang, recording its metrics under "<file>::<lang>"."""
+    CURRENT_FILE.set(f"{file_path}::{target_lang}")
+    with stage("post"):
+        return await write_translated_post(post, file_path, output_path, target_lang, max_retries, segments)
 
-            try:
-                with open(output_path, "w", encoding="utf-8") as f:
-                    logging.info(f"Writing frontmatter to {output_path}")
-                    f.write(new_frontmatter)
-                    ai_message_en = AI_NOTIFICATION_MSG.format(
-                        source_lang=LANGUAGE_NAMES[SOURCE_LANG],
-                        target_lang=LANGUAGE_NAMES[TARGET_LANG]
-                    )
-                    logging.info(f"Translating AI notification message: {ai_message_en}")
-                    ai_message_translated = translate_content(ai_message_en, SOURCE_LANG, TARGET_LANG, TRANSLATION_MODEL)
-                    ai_message_translated = clean_special_quotes(ai_message_translated)
-                    logging.info(f"Writing AI notification message: {ai_message_translated}")
-                    f.write(f"\n{ai_message_translated}\n")
-                    markdown_content = post.content
-                    logging.info(f"Translating markdown content (first 100 chars): {markdown_content[:100]}... (truncated)")
-                    translated_markdown = translate_content(markdown_content, SOURCE_LANG, TARGET_LANG, TRANSLATION_MODEL)
-                    translated_markdown = clean_special_quotes(translated_markdown)
-                    logging.info(f"Writing translated markdown content (first 100 chars): {translated_markdown[:100]}... (truncated)")
-                    f.write(f"\n{translated_markdown}\n")
-                logging.info(f"Successfully wrote translated content to: {output_path}")
-            except Exception as e:
-                logging.error(f"Failed to write output file: {e}")
-                return
-
-            logging.info("Validating frontmatter...")
-            if not validate_frontmatter(output_path):
-                logging.error(f"Invalid frontmatter. Deleting output file. Retry {retries+1}/{max_retries}.")
-                os.remove(output_path)
-                retries += 1
-                if retries > max_retries:
-                    print(f"[FATAL] Frontmatter validation failed after {max_retries} retries. Exiting.")
-                    exit(2)
+async def write_translated_post(post, file_path: str, output_path: str, target_lang: str, max_retries: int,
+                                segments: Optional[list]) -> int:
+    """The body of translate_post: translate every field, validate the frontmatter and write output_path."""
+    # YAML may parse a field as a number or date (title: 2024); translate its text like the baseline did
+    original_title = str(post.get("title") or "") if RENDER_KEYS["title"] else ""
+    if RENDER_KEYS["title"] and not original_title:
+        raise TranslationError(f"No title found in frontmatter of {file_path}.")
+    original_description = str(post.get("description") or "") if RENDER_KEYS.get("description") else ""
+    original_summary = str(post.get("summary") or "") if RENDER_KEYS.get("summary") else ""
+    original_tags = split_terms(post.get("tags", [])) if RENDER_KEYS["tags"] else []
+    original_categories = split_terms(post.get("categories", [])) if RENDER_KEYS["categories"] else []
+    original_author = str(post.get("author") or "") if RENDER_KEYS.get("author") else ""
+    ai_message_en = AI_NOTIFICATION_MSG.format(
+        source_lang=LANGUAGE_NAMES[SOURCE_LANG],
+        target_lang=LANGUAGE_NAMES[target_lang]
+    )
+
+    # Translated fields are retried one by one; the others are copied and only need to parse once
+    field_jobs = {}
+    if RENDER_KEYS["title"]:
+        field_jobs["title"] = lambda: translate_text_field(translate_title, original_title, "title", target_lang)
+    if RENDER_KEYS.get("description"):
+        field_jobs["description"] = lambda: translate_text_field(translate_description, original_description, "description", target_lang)
+    if RENDER_KEYS.get("summary"):
+        field_jobs["summary"] = lambda: translate_text_field(translate_description, original_summary, "summary", target_lang)
+    if RENDER_KEYS["tags"]:
+        field_jobs["tags"] = lambda: translate_terms(original_tags, target_lang, "tags")
+    if RENDER_KEYS["categories"]:
+        field_jobs["categories"] = lambda: translate_terms(original_categories, target_lang, "categories")
+    if RENDER_KEYS.get("author") and original_author:
+        field_jobs["author"] = lambda: translate_author_with_transliteration(translator, original_author, target_lang)
+
+    # Units finished by an interrupted run are replayed from the journal instead of translated again
+    journal_inputs = ProgressJournal.inputs_digest(file_path, target_lang) if PROGRESS_JOURNAL is not None else ""
+    resumed = PROGRESS_JOURNAL.units(file_path, target_lang, journal_inputs) if PROGRESS_JOURNAL is not None else {}
+    if resumed:
+        logging.info(f"Resuming {file_path} ({target_lang}) with {len(resumed)} journaled units.")
+
+    def journal(unit: str, value):
+        if PROGRESS_JOURNAL is not None:
+            PROGRESS_JOURNAL.record(file_path, target_lang, journal_inputs, unit, value)
+        return value
+
+    async def field_unit(key: str, job) -> tuple:
+        if key in resumed:
+            return resumed[key], 1
+        value, attempts = await translate_field_with_retries(key, job, max_retries if key in RETRYABLE_FIELDS else 0)
+        return journal(key, value), attempts
+
+    async def text_unit(unit: str, translate) -> str:
+        if unit in resumed:
+            return resumed[unit]
+        return journal(unit, await translate())
+
+    async def body_unit() -> str:
+        # In streaming mode the body is translated while it is being written, below
+        if STREAM_OUTPUT:
+            return ""
+        return await text_unit("body", lambda: translate_body(post.content, target_lang, segments))
+
+    # Every field is independent, so translate them all at once; wall time ~ the slowest field
+    field_results, ai_message_translated, translated_markdown = await asyncio.gather(
+        asyncio.gather(*(field_unit(key, job) for key, job in field_jobs.items())),
+        text_unit("ai_notice", lambda: translate_text_field(translate_content, ai_message_en, "AI notification message", target_lang)),
+        body_unit(),
+    )
+    ai_message_translated = clean_special_quotes(ai_message_translated)
+    translated_fields = {key: value for key, (value, _) in zip(field_jobs, field_results)}
+    retries = 0
+    for key, (_, attempts) in zip(field_jobs, field_results):
+        if attempts > 1:
+            logging.warning(f"Field '{key}' needed {attempts} attempts to validate.")
+            retries += attempts - 1
+
+    logging.info("Creating new frontmatter...")
+    pinned = post.get("pinned", None)
+    new_metadata = {
+        "title": translated_fields.get("title"),
+        "description": translated_fields.get("description"),
+        "summary": translated_fields.get("summary"),
+        "tags": translated_fields.get("tags"),
+        "categories": translated_fields.get("categories"),
+        "date": post.get("date", "") if RENDER_KEYS["date"] else None,
+        "draft": post.get("draft", "") if RENDER_KEYS["draft"] else None,
+        "author": translated_fields.get("author") or None,
+        "pinned": pinned if RENDER_KEYS.get("pinned") else None
+    }
+    logging.debug("New metadata for frontmatter: %s", new_metadata)
+    lines = []
+    with stage("validate"):
+        for key, value in new_metadata.items():
+            line = render_frontmatter_line(key, value)
+            if line is None:
                 continue
+            if key not in field_jobs and not frontmatter_line_is_valid(key, line):
+                raise FrontmatterValidationError(f"Field '{key}' copied from {file_path} is not valid frontmatter: {line}")
+            lines.append(line)
+        new_frontmatter = "---\n" + "\n".join(lines) + "\n---\n"
+        logging.debug("New frontmatter generated:\n%s", new_frontmatter)
+        header = f"{new_frontmatter}\n{ai_message_translated}\n"
+        if not validate_frontmatter_text(header):
+            raise FrontmatterValidationError(f"Generated frontmatter for {file_path} is invalid")
+    logging.info("Frontmatter validation successful.")
+
+    # Write next to the destination and rename into place, so readers never see a partial post
+    tmp_path = f"{output_path}.part"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            logging.info(f"Writing frontmatter to {tmp_path}")
+            f.write(header)
+            if STREAM_OUTPUT:
+                f.write("\n")
+                with stage("body", len(post.content.encode("utf-8"))):
+                    await stream_markdown_body(post.content, f.write, SOURCE_LANG, target_lang, TRANSLATION_MODEL, segments)
+                f.write("\n")
             else:
-                logging.info("Frontmatter validation successful.")
-                break
+                with stage("write", len(translated_markdown.encode("utf-8"))):
+                    f.write(f"\n{translated_markdown}\n")
+        os.replace(tmp_path, output_path)
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise TranslationError(f"Failed to write output file {output_path}: {e}") from e
+    journal(ProgressJournal.WRITTEN, output_path)
+    logging.info(f"Successfully wrote translated content to: {output_path}")
+    return retries
+
+# Incremental build manifest: skip posts whose source and settings are unchanged
+def file_sha256(path: str) -> str:
+    """Return the SHA-256 of a file's bytes, or an empty string if it does not exist."""
+    if not os.path.exists(path):
+        return ""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def settings_fingerprint() -> str:
+    """Hash the prompts and render settings that shape every translated post."""
+    settings = {
+        "prompts": [TITLE_TRANSLATION_PROMPT, DESCRIPTION_TRANSLATION_PROMPT, CONTENT_TRANSLATION_PROMPT,
+                    SEGMENT_TRANSLATION_PROMPT, AI_NOTIFICATION_MSG],
+        "render_keys": RENDER_KEYS,
+        "segment_markdown": SEGMENT_MARKDOWN,
+        "chunk_tokens": CHUNK_TOKENS,
+        "packed_prompt": PACKED_TRANSLATION_PROMPT if PACKER is not None else None,
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+
+class BuildManifest:
+    """Records the inputs that produced each (input file, target language) output."""
+
+    def __init__(self, path: str = ".marklang_manifest.json", force: bool = False):
+        self.path = path
+        self.force = force
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring unreadable build manifest {path}: {e}")
+
+    @staticmethod
+    def entry_key(input_file: str, target_lang: str) -> str:
+        return f"{os.path.normpath(input_file)}::{target_lang}"
+
+    @staticmethod
+    def fingerprint(input_file: str, source_lang: str, target_lang: str, model: str, dictionary_base: str = "translations") -> dict:
+        """Collect every input that determines the translated output."""
+        return {
+            "source": file_sha256(input_file),
+            "source_lang": source_lang,
+            "model": model,
+            "settings": settings_fingerprint(),
+            "dictionary": file_sha256(os.path.join(dictionary_base, f"translations_{target_lang}.csv")),
+        }
+
+    def is_up_to_date(self, input_file: str, output_file: str, target_lang: str, fingerprint: dict) -> bool:
+        """True if the output exists and was built from exactly these inputs."""
+        if self.force or not os.path.exists(output_file):
+            return False
+        entry = self.entries.get(self.entry_key(input_file, target_lang))
+        return entry is not None and entry.get("output") == output_file and entry.get("fingerprint") == fingerprint
+
+    def record(self, input_file: str, output_file: str, target_lang: str, fingerprint: dict) -> None:
+        self.entries[self.entry_key(input_file, target_lang)] = {"output": output_file, "fingerprint": fingerprint}
+
+    def save(self) -> None:
+        """Write the manifest atomically so an interrupted run never leaves it truncated."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+# Set by main_cli; None disables incremental builds
+BUILD_MANIFEST: Optional[BuildManifest] = None
+
+# Crash-safe progress journal for resumable runs
+class ProgressJournal:
+    """Append-only JSON-lines log of every translated (file, language, unit), so --resume can skip finished work.
+
+    Units are frontmatter fields, "ai_notice", "body" and the WRITTEN marker recorded once the output is in
+    place. Each entry carries a digest of the post's build inputs, so units of a post that changed since are
+    ignored. A torn last line from a crash is skipped on replay.
+
+    Only the latest inputs of each (file, language) are kept, and a written post keeps just its marker, so
+    memory stays bounded in --watch. The file is compacted to those entries once it is mostly superseded lines.
+    """
+
+    WRITTEN = "@written"
+    COMPACT_MIN_LINES = 1000
+
+    def __init__(self, path: str = ".marklang_journal.jsonl", resume: bool = False):
+        self.path = path
+        self.completed = {}  # (file, lang) -> (inputs, {unit: value})
+        self.lines = 0
+        if resume and os.path.exists(path):
+            self._replay()
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def inputs_digest(input_file: str, target_lang: str) -> str:
+        fingerprint = BuildManifest.fingerprint(input_file, SOURCE_LANG, target_lang, TRANSLATION_MODEL)
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    def _apply(self, key: tuple, inputs: str, unit: str, value) -> None:
+        current_inputs, units = self.completed.get(key, (None, {}))
+        if current_inputs != inputs or unit == self.WRITTEN:
+            units = {}
+        units[unit] = value
+        self.completed[key] = (inputs, units)
+
+    def _replay(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                self.lines += 1
+                try:
+                    entry = json.loads(line)
+                    key = (entry["file"], entry["lang"])
+                    self._apply(key, entry["inputs"], entry["unit"], entry.get("value"))
+                except (ValueError, KeyError):
+                    continue
+        logging.info(f"Replayed {self._live_units()} journaled units from {self.path}")
 
-    asyncio.run(main())
+    def _live_units(self) -> int:
+        return sum(len(units) for _, units in self.completed.values())
+
+    def units(self, input_file: str, target_lang: str, inputs: str) -> dict:
+        """The units already completed for this post and language with the same inputs."""
+        current_inputs, units = self.completed.get((os.path.normpath(input_file), target_lang), (None, {}))
+        return dict(units) if current_inputs == inputs else {}
+
+    def is_written(self, input_file: str, output_file: str, target_lang: str) -> bool:
+        """True if a previous run finished this output and it is still on disk."""
+        units = self.units(input_file, target_lang, self.inputs_digest(input_file, target_lang))
+        return units.get(self.WRITTEN) == output_file and os.path.exists(output_file)
+
+    def record(self, input_file: str, target_lang: str, inputs: str, unit: str, value=None) -> None:
+        key = (os.path.normpath(input_file), target_lang)
+        line = json.dumps({"file": key[0], "lang": target_lang, "inputs": inputs, "unit": unit, "value": value},
+                          ensure_ascii=False)
+        with self._lock:
+            self._apply(key, inputs, unit, value)
+            self._file.write(line + "\n")
+            self.lines += 1
+            self._file.flush()
+            if unit == self.WRITTEN:
+                os.fsync(self._file.fileno())
+                if self.lines > max(self.COMPACT_MIN_LINES, 2 * self._live_units()):
+                    self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the journal with only the live entries, atomically; called with the lock held."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for (input_file, target_lang), (inputs, units) in self.completed.items():
+                for unit, value in units.items():
+                    f.write(json.dumps({"file": input_file, "lang": target_lang, "inputs": inputs, "unit": unit,
+                                        "value": value}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self.lines = self._live_units()
+        logging.info(f"Compacted journal {self.path} to {self.lines} entries.")
+
+    def close(self) -> None:
+        self._file.close()
+
+# Set by main_cli; None disables the journal
+PROGRESS_JOURNAL: Optional[ProgressJournal] = None
+
+def post_is_current(input_file: str, output_file: str, target_lang: Optional[str] = None) -> bool:
+    """True if the manifest shows output_file was built from the current input_file and settings."""
+    if BUILD_MANIFEST is None:
+        return False
+    target_lang = target_lang or TARGET_LANG
+    fingerprint = BuildManifest.fingerprint(input_file, SOURCE_LANG, target_lang, TRANSLATION_MODEL)
+    return BUILD_MANIFEST.is_up_to_date(input_file, output_file, target_lang, fingerprint)
+
+async def translate_if_changed(input_file: str, outputs: dict) -> dict:
+    """Translate input_file into every {target_lang: output_file} the manifest does not show as current.
+
+    The post is parsed and segmented once, then all stale languages are translated concurrently. Returns
+    {target_lang: retries}, with None for skipped outputs and the TranslationError for failed ones. Only
+    outputs whose every unit translated are recorded in the manifest; a failed unit fails its output, and
+    an output with blocks kept in the source language is written but not recorded.
+    """
+    results = {}
+    stale = {}
+    for target_lang, output_file in outputs.items():
+        fingerprint = BuildManifest.fingerprint(input_file, SOURCE_LANG, target_lang, TRANSLATION_MODEL)
+        if BUILD_MANIFEST is not None and BUILD_MANIFEST.is_up_to_date(input_file, output_file, target_lang, fingerprint):
+            logging.info(f"Skipping unchanged post: {input_file} ({target_lang})")
+            results[target_lang] = None
+        elif PROGRESS_JOURNAL is not None and PROGRESS_JOURNAL.is_written(input_file, output_file, target_lang):
+            logging.info(f"Skipping post finished by the interrupted run: {input_file} ({target_lang})")
+            if BUILD_MANIFEST is not None:
+                BUILD_MANIFEST.record(input_file, output_file, target_lang, fingerprint)
+            results[target_lang] = None
+        else:
+            stale[target_lang] = (output_file, fingerprint)
+    if not stale:
+        return results
+    CURRENT_FILE.set(input_file)
+    try:
+        post = load_post(input_file)
+    except TranslationError as e:
+        return dict(results, **{target_lang: e for target_lang in stale})
+    segments = segment_markdown(post.content) if SEGMENT_MARKDOWN else None
+
+    async def translate_output(target_lang: str, output_file: str) -> tuple:
+        kept_source = []
+        KEPT_SOURCE_BLOCKS.set(kept_source)
+        return await translate_post(post, input_file, output_file, target_lang, segments=segments), kept_source
+
+    outcomes = await asyncio.gather(
+        *(translate_output(target_lang, output_file) for target_lang, (output_file, _) in stale.items()),
+        return_exceptions=True,
+    )
+    for (target_lang, (output_file, fingerprint)), outcome in zip(stale.items(), outcomes):
+        if isinstance(outcome, Exception) and not isinstance(outcome, TranslationError):
+            # A bug triggered by one post fails that output, not the whole batch
+            logging.debug(f"Unexpected error translating {input_file} ({target_lang})", exc_info=outcome)
+            outcome = TranslationError(f"Unexpected error translating {input_file} ({target_lang}): {outcome!r}")
+        elif isinstance(outcome, BaseException) and not isinstance(outcome, TranslationError):
+            raise outcome
+        if isinstance(outcome, tuple):
+            outcome, kept_source = outcome
+            if kept_source:
+                logging.warning(f"{input_file} ({target_lang}): {len(kept_source)} blocks kept in the source language; "
+                                f"not marking the output current, so the next run retries them.")
+            elif BUILD_MANIFEST is not None:
+                BUILD_MANIFEST.record(input_file, output_file, target_lang, fingerprint)
+        results[target_lang] = outcome
+    return results
+
+def process_markdown(file_path: str, outputs) -> None:
+    """Process a markdown file: translate frontmatter and content into every {target_lang: output_path}.
+
+    A single output path is written in TARGET_LANG.
+    """
+    if isinstance(outputs, str):
+        outputs = {TARGET_LANG: outputs}
+    results = asyncio.run(with_worker_pool(translate_if_changed(file_path, outputs)))
+    failed = False
+    for target_lang, outcome in results.items():
+        if outcome is None:
+            print(f"[INFO] {file_path} is unchanged since the last {target_lang} run. Skipping (use --force to re-translate).")
+        elif isinstance(outcome, FrontmatterValidationError):
+            print(f"[FATAL] {outcome}. Exiting.")
+            failed = True
+        elif isinstance(outcome, TranslationError):
+            print(f"[ERROR] {target_lang}: {outcome}")
+            failed = True
+    if failed:
+        exit(2)
+
+def build_output_path(input_file: str, source_lang: str, target_lang: str, content_root: Optional[str] = None,
+                      create: bool = True) -> str:
+    """Map a source-language path to its target-language counterpart and, if create, ensure its directory exists.
+
+    Only one directory is swapped: the first one named source_lang below content_root, or else the nearest
+    one in content_root itself (the file's own directory in single-file mode). Raises TranslationError when
+    the path has no such directory, since the translation would overwrite its source.
+    """
+    input_file = os.path.normpath(input_file)
+    root = os.path.normpath(content_root) if content_root else os.path.dirname(input_file) or "."
+    rel_parts = os.path.relpath(input_file, root).split(os.sep)
+    root_parts = root.split(os.sep)
+    if source_lang in rel_parts[:-1]:
+        rel_parts[rel_parts.index(source_lang)] = target_lang
+    elif source_lang in root_parts:
+        root_parts[len(root_parts) - 1 - root_parts[::-1].index(source_lang)] = target_lang
+    output_file = os.path.join(os.sep.join(root_parts) or os.sep, *rel_parts)
+    if os.path.abspath(output_file) == os.path.abspath(input_file):
+        raise TranslationError(f"{input_file} is not under a '{source_lang}' directory; "
+                               f"its {target_lang} translation would overwrite it")
+    output_dir = os.path.dirname(output_file)
+    if create and output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+    return output_file
+
+def iter_markdown_files(content_root: str) -> list:
+    """Return every markdown file under content_root, in a stable order."""
+    markdown_files = []
+    for dirpath, dirnames, filenames in os.walk(content_root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith(".md"):
+                markdown_files.append(os.path.join(dirpath, filename))
+    return markdown_files
+
+def iter_source_files(content_root: str, source_lang: str) -> list:
+    """Return the markdown files under content_root to translate.
+
+    When content_root holds one directory per language (content/ rather than content/en/), the other
+    languages' trees are where translations are written, so they are left out.
+    """
+    files = iter_markdown_files(content_root)
+    if source_lang in os.path.normpath(content_root).split(os.sep):
+        return files
+    return [path for path in files
+            if os.path.relpath(path, content_root).split(os.sep)[0] not in set(LANGUAGE_NAMES) - {source_lang}]
+
+def collect_post_terms(post) -> list:
+    """Return the tag, category and author terms of a parsed post that will go through Googletrans."""
+    terms = []
+    if RENDER_KEYS["tags"]:
+        terms.extend(split_terms(post.get("tags", [])))
+    if RENDER_KEYS["categories"]:
+        terms.extend(split_terms(post.get("categories", [])))
+    if RENDER_KEYS.get("author") and post.get("author"):
+        terms.append(str(post.get("author")))
+    return terms
+
+async def process_site_async(content_root: str, concurrency: int = 4, target_langs: Optional[list] = None) -> dict:
+    """Translate every markdown file under content_root into each target language.
+
+    At most `concurrency` source files are in flight; each one is parsed once and fanned out to every language.
+    """
+    target_langs = target_langs or [TARGET_LANG]
+    files = iter_source_files(content_root, SOURCE_LANG)
+    logging.info(f"Found {len(files)} markdown files under {content_root}")
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    stats = {"files": len(files), "outputs": len(files) * len(target_langs), "succeeded": 0, "skipped": 0,
+             "failed": 0, "retries": 0, "failures": [], "latencies": []}
+    outputs_by_file = {}
+    for input_file in files:
+        try:
+            outputs_by_file[input_file] = {lang: build_output_path(input_file, SOURCE_LANG, lang, content_root)
+                                           for lang in target_langs}
+        except TranslationError as e:
+            logging.error(str(e))
+            stats["failed"] += len(target_langs)
+            stats["failures"].extend(f"{input_file} ({lang})" for lang in target_langs)
+
+    async def worker(input_file: str) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            results = await translate_if_changed(input_file, outputs_by_file[input_file])
+            translated = False
+            for target_lang, outcome in results.items():
+                if outcome is None:
+                    stats["skipped"] += 1
+                elif isinstance(outcome, TranslationError):
+                    logging.error(str(outcome))
+                    stats["failed"] += 1
+                    stats["failures"].append(f"{input_file} ({target_lang})")
+                else:
+                    stats["retries"] += outcome
+                    stats["succeeded"] += 1
+                    translated = True
+            if translated:
+                stats["latencies"].append(time.perf_counter() - started)
+
+    start = time.perf_counter()
+    # Translate each distinct term once per language for the whole site before the posts ask for them.
+    # Only the terms are kept, so memory does not grow with the site; workers parse their post again.
+    site_terms = {lang: [] for lang in target_langs}
+    for input_file, outputs in outputs_by_file.items():
+        stale_langs = [lang for lang, output_file in outputs.items() if not post_is_current(input_file, output_file, lang)]
+        if not stale_langs:
+            continue
+        token = CURRENT_FILE.set(input_file)
+        try:
+            terms = collect_post_terms(load_post(input_file))
+        except TranslationError:
+            continue  # Reported by the post's worker
+        finally:
+            CURRENT_FILE.reset(token)
+        for lang in stale_langs:
+            site_terms[lang].extend(terms)
+    service = get_term_service(translator)
+    with stage("term_prefetch"):
+        await asyncio.gather(*(service.prefetch(terms, lang) for lang, terms in site_terms.items()))
+    await asyncio.gather(*(worker(input_file) for input_file in outputs_by_file))
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+def process_site(content_root: str, concurrency: int = 4, target_langs: Optional[list] = None) -> dict:
+    """Translate a whole content tree sharing one translator, dictionary and HTTP session, then print a summary."""
+    stats = asyncio.run(with_worker_pool(process_site_async(content_root, concurrency, target_langs)))
+    files_per_sec = stats["files"] / stats["elapsed"] if stats["elapsed"] > 0 else 0.0
+    print(f"[INFO] Processed {stats['files']} files into {stats['outputs']} outputs in {stats['elapsed']:.2f}s ({files_per_sec:.2f} files/sec)")
+    print(f"[INFO] Succeeded: {stats['succeeded']}, skipped (unchanged): {stats['skipped']}, failed: {stats['failed']}, retries: {stats['retries']}")
+    for failed_file in stats["failures"]:
+        print(f"[ERROR] Failed: {failed_file}")
+    return stats
+
+# Dry-run planning: project requests, tokens and time from local files only
+# Output tokens per source token; non-Latin scripts take more tokens for the same text
+SCRIPT_TOKEN_FACTOR = {"hi": 2.0, "th": 2.0}
+
+def format_prompt(template: str, text: str, source_lang: str, target_lang: str, **extra) -> str:
+    return template.format(
+        source_lang_full=LANGUAGE_NAMES[source_lang],
+        source_lang_code=source_lang,
+        target_lang_full=LANGUAGE_NAMES[target_lang],
+        target_lang_code=target_lang,
+        text=text,
+        **extra
+    )
+
+def plan_post(post, target_lang: str, segments: Optional[list], planned_keys: Optional[set] = None) -> dict:
+    """Estimate the Ollama requests and tokens needed to translate one parsed post into target_lang.
+
+    Mirrors write_translated_post: the same RENDER_KEYS selection, prompts, segmentation, chunking and glossary
+    shortcuts. Units already in the translation memory cost nothing. Pass planned_keys when the run will use
+    the memory: units whose cache key is already in it cost nothing either, since the run will have cached
+    them by then, and new keys are added to it. Packable fields are only counted in "packed_tokens", since how
+    many requests they take depends on the whole run.
+    """
+    estimate = {"requests": 0, "prompt_tokens": 0, "output_tokens": 0, "cached": 0, "packed_items": 0, "packed_tokens": 0}
+    factor = SCRIPT_TOKEN_FACTOR.get(target_lang, 1.0)
+
+    def is_cached(text: str, template: str) -> bool:
+        _, cached = cache_lookup(text, SOURCE_LANG, target_lang, TRANSLATION_MODEL, template)
+        if cached is not None:
+            return True
+        if planned_keys is None:
+            return False
+        key = TranslationCache.make_key(text, SOURCE_LANG, target_lang, TRANSLATION_MODEL, template)
+        if key in planned_keys:
+            return True
+        planned_keys.add(key)
+        return False
+
+    def request(template: str, text: str, cache_template: Optional[str] = None, **extra) -> None:
+        if is_cached(text, cache_template or template):
+            estimate["cached"] += 1
+            return
+        estimate["requests"] += 1
+        estimate["prompt_tokens"] += estimate_tokens(format_prompt(template, text, SOURCE_LANG, target_lang, **extra))
+        estimate["output_tokens"] += int(estimate_tokens(text) * factor)
+
+    def field(template: str, text: str) -> None:
+        if not text:
+            return
+        if PACKER is not None and estimate_tokens(text) <= PACKER.token_budget // 2:
+            if is_cached(text, PACKED_TRANSLATION_PROMPT):
+                estimate["cached"] += 1
+            else:
+                estimate["packed_items"] += 1
+                estimate["packed_tokens"] += estimate_tokens(text)
+            return
+        request(template, text)
+
+    if RENDER_KEYS["title"]:
+        field(TITLE_TRANSLATION_PROMPT, str(post.get("title") or ""))
+    if RENDER_KEYS.get("description"):
+        field(DESCRIPTION_TRANSLATION_PROMPT, str(post.get("description") or ""))
+    if RENDER_KEYS.get("summary"):
+        field(DESCRIPTION_TRANSLATION_PROMPT, str(post.get("summary") or ""))
+    field(CONTENT_TRANSLATION_PROMPT, AI_NOTIFICATION_MSG.format(
+        source_lang=LANGUAGE_NAMES[SOURCE_LANG], target_lang=LANGUAGE_NAMES[target_lang]))
+
+    if not post.content:
+        return estimate
+    if not SEGMENT_MARKDOWN:
+        for chunk in chunk_markdown(post.content, CHUNK_TOKENS):
+            request(CONTENT_TRANSLATION_PROMPT, chunk)
+        return estimate
+    glossary = get_glossary()
+    for text in dict.fromkeys(segment.text for segment in segments if segment.translatable):
+        masked, spans = mask_protected_spans(text)
+        if not re.search(r"[^\W\d_]", PLACEHOLDER_RE.sub("", masked)):
+            continue
+        if not spans and glossary.translate_phrase(text, target_lang) is not None:
+            continue
+        for piece in split_prose(masked, CHUNK_TOKENS):
+            hint = glossary.prompt_hint(PLACEHOLDER_RE.sub(" ", piece), target_lang)
+            request(SEGMENT_TRANSLATION_PROMPT, piece, SEGMENT_TRANSLATION_PROMPT + hint, glossary=hint)
+    return estimate
+
+def measured_token_rates(metrics_path: str) -> tuple:
+    """Read (output tokens/sec, prompt tokens/sec) per request from a --metrics-out JSON-lines file."""
+    totals = dict.fromkeys(METRIC_FIELDS, 0)
+    with open(metrics_path, "r", encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry.get("scope") == "run" and entry.get("stage") != "wall":
+                for field in METRIC_FIELDS:
+                    totals[field] += entry.get(field, 0)
+    output_rate = totals["eval_tokens"] / totals["eval_seconds"] if totals["eval_seconds"] else 0.0
+    prompt_rate = totals["prompt_tokens"] / totals["prompt_eval_seconds"] if totals["prompt_eval_seconds"] else 0.0
+    return output_rate, prompt_rate
+
+def plan_site(input_path: str, target_langs: list, output_rate: float, prompt_rate: float, endpoints: int = 1,
+              memory: bool = True) -> dict:
+    """Print a per-file and total projection of a run over input_path without sending any network request.
+
+    memory says whether the run stores translations, so a text repeated across posts is only sent once.
+
+    Wall time assumes each endpoint generates one response at a time at the given per-request rates, which
+    makes it an upper bound when Ollama serves parallel requests.
+    """
+    content_root = input_path if os.path.isdir(input_path) else None
+    files = iter_source_files(input_path, SOURCE_LANG) if content_root else [input_path]
+    totals = {"outputs": 0, "current": 0, "requests": 0, "prompt_tokens": 0, "output_tokens": 0, "cached": 0,
+              "packed_items": 0, "packed_tokens": 0, "packed_requests": 0}
+    site_terms = {lang: [] for lang in target_langs}
+    packed_tokens = {lang: 0 for lang in target_langs}
+    rows = []
+    planned_keys = set() if memory else None  # cache keys the run will already have translated
+    for input_file in files:
+        try:
+            outputs = {lang: build_output_path(input_file, SOURCE_LANG, lang, content_root, create=False)
+                       for lang in target_langs}
+        except TranslationError as e:
+            logging.warning(str(e))
+            continue
+        stale = [lang for lang, output_file in outputs.items() if not post_is_current(input_file, output_file, lang)]
+        totals["outputs"] += len(outputs)
+        totals["current"] += len(outputs) - len(stale)
+        if not stale:
+            continue
+        try:
+            post = frontmatter.load(input_file)
+        except Exception as e:
+            logging.warning(f"Could not read {input_file}: {e}")
+            continue
+        segments = segment_markdown(post.content) if SEGMENT_MARKDOWN else None
+        terms = collect_post_terms(post)
+        for lang in stale:
+            estimate = plan_post(post, lang, segments, planned_keys)
+            site_terms[lang].extend(terms)
+            packed_tokens[lang] += estimate["packed_tokens"]
+            for key in ("requests", "prompt_tokens", "output_tokens", "cached", "packed_items", "packed_tokens"):
+                totals[key] += estimate[key]
+            seconds = estimate["prompt_tokens"] / prompt_rate + estimate["output_tokens"] / output_rate
+            rows.append((input_file, lang, estimate, seconds))
+
+    # Packed fields share requests per language, each carrying the packed prompt once
+    preamble = estimate_tokens(format_prompt(PACKED_TRANSLATION_PROMPT, "", SOURCE_LANG, target_langs[0], items=""))
+    for lang, tokens in packed_tokens.items():
+        if tokens:
+            packed_requests = -(-tokens // PACKER.token_budget)
+            totals["packed_requests"] += packed_requests
+            totals["prompt_tokens"] += tokens + packed_requests * preamble
+            totals["output_tokens"] += int(tokens * SCRIPT_TOKEN_FACTOR.get(lang, 1.0))
+
+    # Googletrans only sees distinct terms the glossary and translation memory do not already cover
+    glossary = get_glossary()
+    term_counts = {"distinct": 0, "glossary": 0, "cached": 0, "remaining": 0, "requests": 0}
+    for lang, terms in site_terms.items():
+        distinct = {term.strip().lower(): term for term in terms if term.strip()}
+        remaining = 0
+        for term in distinct.values():
+            if glossary.translate_phrase(term, lang):
+                term_counts["glossary"] += 1
+            elif cache_lookup(term, "auto", lang, "googletrans", "")[1] is not None:
+                term_counts["cached"] += 1
+            else:
+                remaining += 1
+        term_counts["distinct"] += len(distinct)
+        term_counts["remaining"] += remaining
+        term_counts["requests"] += -(-remaining // max(GOOGLETRANS_BATCH_SIZE, 1))
+
+    print(f"{'file':<50} {'lang':<5} {'requests':>8} {'prompt_tok':>10} {'output_tok':>10} {'cached':>6} {'packed':>6} {'est_s':>8}")
+    for input_file, lang, estimate, seconds in rows:
+        print(f"{input_file:<50} {lang:<5} {estimate['requests']:>8} {estimate['prompt_tokens']:>10} "
+              f"{estimate['output_tokens']:>10} {estimate['cached']:>6} {estimate['packed_items']:>6} {seconds:>8.1f}")
+    ollama_seconds = (totals["prompt_tokens"] / prompt_rate + totals["output_tokens"] / output_rate) / max(endpoints, 1)
+    googletrans_seconds = term_counts["requests"] / GOOGLETRANS_RPS if GOOGLETRANS_RPS > 0 else 0.0
+    totals["seconds"] = max(ollama_seconds, googletrans_seconds)
+    totals["googletrans"] = term_counts
+    print(f"[INFO] Plan: {totals['outputs'] - totals['current']} of {totals['outputs']} outputs to translate "
+          f"({totals['current']} up to date) from {len(files)} files")
+    print(f"[INFO] Ollama: {totals['requests'] + totals['packed_requests']} requests "
+          f"({totals['packed_items']} fields packed into {totals['packed_requests']}, {totals['cached']} units cached), "
+          f"~{totals['prompt_tokens']} prompt + ~{totals['output_tokens']} output tokens")
+    print(f"[INFO] Googletrans: {term_counts['distinct']} distinct terms, {term_counts['glossary']} from glossary, "
+          f"{term_counts['cached']} cached, {term_counts['remaining']} to translate in {term_counts['requests']} requests")
+    print(f"[INFO] Projected wall time: ~{totals['seconds']:.0f}s at {output_rate:.1f} output / {prompt_rate:.1f} prompt "
+          f"tokens/sec over {max(endpoints, 1)} endpoint(s)")
+    return totals
+
+# Watch mode: one warm process that retranslates posts as they are saved
+def snapshot_tree(paths: list) -> dict:
+    """Map each existing path to its (mtime_ns, size), the cheap change signal polled by watch mode."""
+    snapshot = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+def reload_glossary(base_path: str = "translations") -> None:
+    """Recompile the glossary after a dictionary CSV changed and forget terms resolved with the old one."""
+    global GLOSSARY
+    glossary = Glossary.load(base_path, GLOSSARY_CACHE_DIR)
+    with GLOSSARY_LOCK:
+        GLOSSARY = glossary
+    if TERM_SERVICE is not None:
+        TERM_SERVICE.results.clear()
+
+async def watch_site_async(content_root: str, target_langs: Optional[list] = None, concurrency: int = 4,
+                           interval: float = 0.5, debounce: float = 0.3, dictionary_base: str = "translations") -> None:
+    """Poll content_root forever and translate every post that is created or modified.
+
+    A post is queued once it has been quiet for `debounce` seconds, so an editor's burst of saves costs one
+    translation. The translator, HTTP session, caches and glossary stay warm between saves, and the manifest
+    still skips saves that did not change the source.
+    """
+    target_langs = target_langs or [TARGET_LANG]
+    queue = asyncio.Queue()
+    queued = set()
+    running = set()
+    resaved = set()  # posts saved again while being translated; re-queued once that job finishes
+    changed = {}  # path -> monotonic time of its latest change
+
+    def enqueue(input_file: str) -> None:
+        if input_file in running:
+            resaved.add(input_file)
+        elif input_file not in queued:
+            queued.add(input_file)
+            queue.put_nowait(input_file)
+
+    async def translate_saved(input_file: str) -> None:
+        started = time.perf_counter()
+        try:
+            outputs = {lang: build_output_path(input_file, SOURCE_LANG, lang, content_root) for lang in target_langs}
+            results = await translate_if_changed(input_file, outputs)
+        except TranslationError as e:
+            logging.error(str(e))
+            results = {}
+        except Exception as e:
+            logging.exception(f"Unexpected error translating {input_file}: {e}")
+            results = {}
+        for target_lang, outcome in results.items():
+            if isinstance(outcome, TranslationError):
+                logging.error(f"{input_file} ({target_lang}): {outcome}")
+        done = [lang for lang, outcome in results.items() if isinstance(outcome, int)]
+        if done:
+            print(f"[INFO] Translated {input_file} -> {', '.join(done)} in {time.perf_counter() - started:.2f}s")
+        if BUILD_MANIFEST is not None:
+            BUILD_MANIFEST.save()
+
+    async def worker() -> None:
+        while True:
+            input_file = await queue.get()
+            queued.discard(input_file)
+            running.add(input_file)
+            try:
+                await translate_saved(input_file)
+            finally:
+                running.discard(input_file)
+                queue.task_done()
+            if input_file in resaved:
+                resaved.discard(input_file)
+                enqueue(input_file)
+
+    def dictionary_files() -> list:
+        return sorted(glob.glob(os.path.join(dictionary_base, "translations_*.csv")))
+
+    # Catch up on anything saved while the watcher was not running
+    posts = snapshot_tree(iter_source_files(content_root, SOURCE_LANG))
+    dictionaries = snapshot_tree(dictionary_files())
+    for input_file in posts:
+        enqueue(input_file)
+    workers = [asyncio.ensure_future(worker()) for _ in range(max(concurrency, 1))]
+    print(f"[INFO] Watching {content_root} ({len(posts)} posts) for changes; press Ctrl+C to stop.")
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            current = snapshot_tree(dictionary_files())
+            if current != dictionaries:
+                dictionaries = current
+                logging.info("Dictionary changed; recompiling the glossary.")
+                reload_glossary(dictionary_base)
+            current = snapshot_tree(iter_source_files(content_root, SOURCE_LANG))
+            now = time.monotonic()
+            for input_file, signature in current.items():
+                if posts.get(input_file) != signature:
+                    changed[input_file] = now
+            posts = current
+            for input_file, last_change in list(changed.items()):
+                if input_file not in posts:
+                    del changed[input_file]
+                elif now - last_change >= debounce:
+                    del changed[input_file]
+                    enqueue(input_file)
+    finally:
+        for task in workers:
+            task.cancel()
+
+def watch_site(content_root: str, target_langs: Optional[list] = None, concurrency: int = 4,
+               interval: float = 0.5, debounce: float = 0.3) -> None:
+    """Run watch mode until interrupted."""
+    asyncio.run(with_worker_pool(watch_site_async(content_root, target_langs, concurrency, interval, debounce)))
 
 def validate_language_code(lang_code: str) -> bool:
     """Check if the language code is supported."""
     return lang_code in LANGUAGE_NAMES
 
+def parse_target_langs(value: str, source_lang: str) -> list:
+    """Expand a target_lang argument: one code, a comma-separated list, or "all" (every language but the source)."""
+    if value.strip().lower() == "all":
+        return [lang for lang in LANGUAGE_NAMES if lang != source_lang]
+    return list(dict.fromkeys(lang.strip() for lang in value.split(",") if lang.strip()))
+
 def main_cli() -> None:
     """Main CLI entry point for MarkLang translation script."""
     parser = argparse.ArgumentParser(description="Translate a markdown file with frontmatter to a target language.")
-    parser.add_argument("input_file", type=str, help="Path to the input markdown file (with frontmatter)")
-    parser.add_argument("target_lang", type=str, help="Target language code (e.g., fr, de, hi, etc.)")
+    parser.add_argument("input_file", type=str, help="Path to the input markdown file (with frontmatter), or a content directory to translate every post in it")
+    parser.add_argument("target_lang", type=str, help="Target language code (e.g., fr, de, hi, etc.), a comma-separated list (fr,de,hi), or 'all'")
     parser.add_argument("--source_lang", type=str, default="en", help="Source language code (default: en)")
     parser.add_argument("--model", type=str, default="llama3.2:3b", help="Translation model to use (default: llama3.2:3b)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Number of files translated concurrently in directory mode (default: 4)")
+    parser.add_argument("--max-inflight", type=int, default=8, help="Maximum concurrent requests to each Ollama endpoint (default: 8)")
+    parser.add_argument("--endpoint", action="append", default=[], metavar="URL[,weight=W][,max-inflight=N]",
+                        help="Ollama endpoint to balance requests across; repeat for several hosts (default: $OLLAMA_API_URL or localhost)")
+    parser.add_argument("--keep-alive", type=str, default="30m", help="How long Ollama keeps the model loaded between requests (default: 30m)")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-request Ollama read timeout in seconds (default: 300)")
+    parser.add_argument("--stream", action="store_true", help="Stream the body translation into the output file as tokens arrive")
+    parser.add_argument("--stall-timeout", type=float, default=60.0, help="In --stream mode, fail a request after this many seconds without tokens (default: 60)")
+    parser.add_argument("--googletrans-rps", type=float, default=5.0, help="Maximum Googletrans requests per second (default: 5)")
+    parser.add_argument("--googletrans-batch-size", type=int, default=50, help="Tags/categories sent per Googletrans request (default: 50)")
+    parser.add_argument("--cache-dir", type=str, default=".marklang_cache", help="Directory for the persistent translation memory (default: .marklang_cache)")
+    parser.add_argument("--cache-max-entries", type=int, default=100000, help="Maximum cached translations before LRU eviction (default: 100000)")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the translation memory entirely")
+    parser.add_argument("--refresh-cache", action="store_true", help="Ignore cached translations but store fresh results")
+    parser.add_argument("--manifest", type=str, default=".marklang_manifest.json", help="Build manifest used to skip unchanged posts (default: .marklang_manifest.json)")
+    parser.add_argument("--journal", type=str, default=".marklang_journal.jsonl", help="Append-only log of translated units, replayed by --resume (default: .marklang_journal.jsonl)")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted run, reusing every unit recorded in the journal; outputs it finished are skipped even with --force")
+    parser.add_argument("--force", action="store_true", help="Re-translate every post even if the manifest says it is up to date")
+    parser.add_argument("--chunk-tokens", type=int, default=1024, help="Largest body text, in estimated tokens, sent in one request; longer bodies are split at block boundaries (default: 1024)")
+    parser.add_argument("--plan", action="store_true", help="Estimate requests, tokens and time for this run without sending any network request")
+    parser.add_argument("--tokens-per-sec", type=float, default=30.0, help="Output tokens/sec per request assumed by --plan (default: 30)")
+    parser.add_argument("--prompt-tokens-per-sec", type=float, default=500.0, help="Prompt tokens/sec per request assumed by --plan (default: 500)")
+    parser.add_argument("--plan-metrics", type=str, default="", help="Take --plan's token rates from a previous run's --metrics-out JSON-lines file")
+    parser.add_argument("--watch", action="store_true", help="Stay resident and translate posts under the content directory as they are saved")
+    parser.add_argument("--watch-interval", type=float, default=0.5, help="Seconds between polls of the content tree in --watch mode (default: 0.5)")
+    parser.add_argument("--debounce", type=float, default=0.3, help="Seconds a post must stay unchanged before --watch translates it (default: 0.3)")
+    parser.add_argument("--no-segment", action="store_true", help="Send the whole body to the model in one prompt instead of translating prose blocks only")
+    parser.add_argument("--pack", action="store_true", help="Pack short fields (titles, descriptions, summaries, AI notices) from many posts into shared Ollama requests")
+    parser.add_argument("--pack-tokens", type=int, default=512, help="Estimated source tokens per packed request (default: 512)")
+    parser.add_argument("--log-level", type=str.upper, default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="Logging verbosity (default: WARNING)")
+    parser.add_argument("--metrics-out", type=str, default="", help="Write per-file, per-stage timings and token counts to this file at the end of the run")
+    parser.add_argument("--metrics-format", type=str, default="", choices=["", "jsonl", "prometheus"], help="Format of --metrics-out (default: prometheus for *.prom, otherwise jsonl)")
     args = parser.parse_args()
+    logging.basicConfig(level=args.log_level, format="[%(levelname)s] %(message)s")
 
-    global SOURCE_LANG, TARGET_LANG, TRANSLATION_MODEL
+    global SOURCE_LANG, TARGET_LANG, TARGET_LANGS, TRANSLATION_MODEL, TRANSLATION_CACHE, BUILD_MANIFEST, SEGMENT_MARKDOWN
+    global PROGRESS_JOURNAL
+    global STREAM_OUTPUT, STALL_TIMEOUT, PACKER, CHUNK_TOKENS, GLOSSARY_CACHE_DIR, GOOGLETRANS_RPS, GOOGLETRANS_BATCH_SIZE
     SOURCE_LANG = args.source_lang
-    TARGET_LANG = args.target_lang
+    TARGET_LANGS = parse_target_langs(args.target_lang, SOURCE_LANG)
+    TARGET_LANG = TARGET_LANGS[0] if TARGET_LANGS else args.target_lang
     TRANSLATION_MODEL = args.model
+    SEGMENT_MARKDOWN = not args.no_segment
+    CHUNK_TOKENS = max(args.chunk_tokens, 16)
+    STREAM_OUTPUT = args.stream
+    STALL_TIMEOUT = args.stall_timeout
+    if args.pack:
+        PACKER = SegmentPacker(token_budget=args.pack_tokens)
 
     # Language code validation
     if not validate_language_code(SOURCE_LANG):
         print(f"[ERROR] Unsupported source language code: {SOURCE_LANG}")
         print(f"Supported codes: {list(LANGUAGE_NAMES.keys())}")
         exit(1)
-    if not validate_language_code(TARGET_LANG):
-        print(f"[ERROR] Unsupported target language code: {TARGET_LANG}")
-        print(f"Supported codes: {list(LANGUAGE_NAMES.keys())}")
-        exit(1)
+    for target_lang in TARGET_LANGS or [args.target_lang]:
+        if not validate_language_code(target_lang):
+            print(f"[ERROR] Unsupported target language code: {target_lang}")
+            print(f"Supported codes: {list(LANGUAGE_NAMES.keys())}")
+            exit(1)
 
     input_file = args.input_file
-    output_file = input_file.replace(f"{SOURCE_LANG}/", f"{TARGET_LANG}/")
-    output_dir = os.path.dirname(output_file)
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir, exist_ok=True)
-    load_custom_dictionary(TARGET_LANG)
+    # A dry run reads an existing cache directory but never creates one
+    use_cache = not args.no_cache and (os.path.isdir(args.cache_dir) or not args.plan)
+    GLOSSARY_CACHE_DIR = args.cache_dir if use_cache else None
+    available = TRANSLITERATION.warm_up(TARGET_LANGS)
+    backend_report = ", ".join(f"{lang}={'ready' if ok else 'unavailable'}" for lang, ok in available.items())
+    print(f"[INFO] Transliteration backends: {backend_report}")
+    GOOGLETRANS_RPS = args.googletrans_rps
+    GOOGLETRANS_BATCH_SIZE = args.googletrans_batch_size
+    get_glossary()
+    if use_cache and not args.plan:
+        TRANSLATION_CACHE = TranslationCache(args.cache_dir, args.cache_max_entries, refresh=args.refresh_cache)
+    elif use_cache and os.path.exists(os.path.join(args.cache_dir, TranslationCache.FILENAME)):
+        TRANSLATION_CACHE = TranslationCache(args.cache_dir, refresh=args.refresh_cache, read_only=True)
+    BUILD_MANIFEST = BuildManifest(args.manifest, force=args.force)
+    if args.plan:
+        output_rate, prompt_rate = args.tokens_per_sec, args.prompt_tokens_per_sec
+        if args.plan_metrics:
+            measured_output, measured_prompt = measured_token_rates(args.plan_metrics)
+            output_rate, prompt_rate = measured_output or output_rate, measured_prompt or prompt_rate
+        plan_site(input_file, TARGET_LANGS, max(output_rate, 0.01), max(prompt_rate, 0.01), max(len(args.endpoint), 1),
+                  memory=not (args.no_cache or args.refresh_cache))
+        if TRANSLATION_CACHE is not None:
+            TRANSLATION_CACHE.close()
+        return
     try:
-        process_markdown(input_file, output_file)
+        configure_ollama_client(args.max_inflight, args.timeout, args.endpoint, keep_alive=args.keep_alive or None)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        exit(1)
+    health = OLLAMA_CLIENT.check_health()
+    print(f"[INFO] Ollama endpoints: {sum(health.values())}/{len(health)} healthy")
+    PROGRESS_JOURNAL = ProgressJournal(args.journal, resume=args.resume)
+    try:
+        if args.watch:
+            if not os.path.isdir(input_file):
+                print(f"[ERROR] --watch needs a content directory, not {input_file}")
+                exit(1)
+            watch_site(input_file, TARGET_LANGS, args.concurrency, args.watch_interval, args.debounce)
+        elif os.path.isdir(input_file):
+            stats = process_site(input_file, args.concurrency, TARGET_LANGS)
+            if stats["failed"]:
+                exit(2)
+        else:
+            try:
+                outputs = {target_lang: build_output_path(input_file, SOURCE_LANG, target_lang) for target_lang in TARGET_LANGS}
+            except TranslationError as e:
+                print(f"[ERROR] {e}")
+                exit(2)
+            process_markdown(input_file, outputs)
     except KeyboardInterrupt:
         print("\n[INFO] Translation interrupted by user. Exiting gracefully.")
         exit(0)
+    finally:
+        BUILD_MANIFEST.save()
+        PROGRESS_JOURNAL.close()
+        for line in OLLAMA_CLIENT.report():
+            print(f"[INFO] Ollama endpoint {line}")
+        if PACKER is not None:
+            print(f"[INFO] Packed fields: {PACKER.stats['items']} items in {PACKER.stats['requests']} requests, "
+                  f"{PACKER.stats['fallbacks']} fell back to individual requests")
+        if TERM_SERVICE is not None:
+            term_stats = TERM_SERVICE.stats
+            print(f"[INFO] Googletrans terms: {term_stats['terms']} distinct, {term_stats['glossary_hits']} from glossary, "
+                  f"{term_stats['cache_hits']} cached, {term_stats['requests']} requests, "
+                  f"{term_stats['retries']} retries, {term_stats['failures']} failures")
+        if TRANSLATION_CACHE is not None:
+            print(f"[INFO] Translation cache: {TRANSLATION_CACHE.hits} hits, {TRANSLATION_CACHE.misses} misses")
+            TRANSLATION_CACHE.close()
+        for stage_name, total in sorted(METRICS.run_totals().items()):
+            logging.info(f"Stage {stage_name}: {total['calls']} calls, {total['seconds']:.2f}s, {total['bytes']} bytes, "
+                         f"{total['prompt_tokens']} prompt / {total['eval_tokens']} eval tokens")
+        if args.metrics_out:
+            METRICS.export(args.metrics_out, args.metrics_format)
+            print(f"[INFO] Metrics written to {args.metrics_out}")
 
 if __name__ == "__main__":
     main_cli()